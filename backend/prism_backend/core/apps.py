@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'prism_backend.core'
+
+    def ready(self):
+        from . import signals  # noqa: F401
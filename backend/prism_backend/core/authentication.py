@@ -0,0 +1,82 @@
+"""
+JWT authentication without a user query on every request.
+
+CachedJWTAuthentication resolves the token's user from a small in-process
+cache of user rows kept for JWT_USER_CACHE_TTL seconds. Read-only requests
+are answered from it, so a deleted or deactivated user is turned away at
+most that many seconds after the change. Requests that write always load
+the row and are rejected at once. Saving or deleting a user also drops its
+entry in the current process (see signals).
+
+simplejwt's JWTStatelessUserAuthentication returns a TokenUser built from
+the claims, which cannot be used in owner=request.user lookups or as the
+owner of new rows; the cached row is a real User, so views are unchanged.
+"""
+import copy
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# Entries kept before the cache is emptied and refilled
+MAX_CACHED_USERS = 10000
+
+_users = {}
+
+
+def cached_user(user_id):
+    """Return the user row for user_id (None if missing), at most JWT_USER_CACHE_TTL seconds old."""
+    now = time.monotonic()
+    entry = _users.get(user_id)
+    if entry and entry[0] > now:
+        return entry[1]
+
+    user = get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+    if len(_users) >= MAX_CACHED_USERS:
+        _users.clear()
+    _users[user_id] = (now + settings.JWT_USER_CACHE_TTL, user)
+    return user
+
+
+def forget_user(user_id):
+    """Drop user_id from this process's cache."""
+    _users.pop(user_id, None)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that serves read-only requests from the cached user row.
+    """
+    read_only = False
+
+    def authenticate(self, request):
+        self.read_only = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if not self.read_only:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        # Each request gets its own instance, so views may modify it freely
+        return copy.copy(user)
@@ -0,0 +1,41 @@
+"""
+Helpers for conditional GET requests.
+
+Views compute an ETag from a cheap change marker before doing any real
+work; when it matches the client's If-None-Match header they answer
+304 Not Modified without querying or serializing anything.
+"""
+import hashlib
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    """Build a strong ETag from the given change-marker parts."""
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode(), usedforsecurity=False)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request, etag):
+    """Return True when the request's If-None-Match header covers etag."""
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    etags = parse_etags(header)
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    return '*' in etags or etag in {tag.removeprefix('W/') for tag in etags}
+
+
+def not_modified(etag):
+    response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    set_etag(response, etag)
+    return response
+
+
+def set_etag(response, etag):
+    """Attach etag to response and require clients to revalidate per-user data."""
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,31 @@
+"""
+Password hashers with costs taken from settings.PASSWORD_HASHER_COSTS.
+
+Each keeps the algorithm name of the Django hasher it extends, so hashes
+made with other costs still verify. Django's check_password() re-hashes a
+password on the next successful login whenever its algorithm is not the
+preferred one or its costs differ from these, so changing the profile or
+the costs upgrades stored hashes without any migration.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+def _cost(algorithm, name, default):
+    return getattr(settings, 'PASSWORD_HASHER_COSTS', {}).get(algorithm, {}).get(name, default)
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    iterations = _cost('pbkdf2_sha256', 'iterations', hashers.PBKDF2PasswordHasher.iterations)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    time_cost = _cost('argon2', 'time_cost', hashers.Argon2PasswordHasher.time_cost)
+    memory_cost = _cost('argon2', 'memory_cost', hashers.Argon2PasswordHasher.memory_cost)
+    parallelism = _cost('argon2', 'parallelism', hashers.Argon2PasswordHasher.parallelism)
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    work_factor = _cost('scrypt', 'work_factor', hashers.ScryptPasswordHasher.work_factor)
+    block_size = _cost('scrypt', 'block_size', hashers.ScryptPasswordHasher.block_size)
+    parallelism = _cost('scrypt', 'parallelism', hashers.ScryptPasswordHasher.parallelism)
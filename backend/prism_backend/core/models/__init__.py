@@ -1,3 +1,4 @@
 from .user import User
+from .token import RevokedToken
 
-__all__ = ['User']
\ No newline at end of file
+__all__ = ['User', 'RevokedToken']
@@ -0,0 +1,14 @@
+from django.db import models
+
+
+class RevokedToken(models.Model):
+    """
+    A refresh token that may no longer be used, by its JTI claim.
+    Rows are only needed until the token would have expired anyway, after
+    which prune_revoked_tokens deletes them.
+    """
+    jti = models.CharField(max_length=64, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.jti
@@ -0,0 +1,29 @@
+"""
+Shared test fixtures.
+"""
+from django.test import TestCase
+from rest_framework.test import APIClient
+from .models import User
+
+PASSWORD = 'password-123'
+
+
+def create_user(email='owner@example.com', **fields):
+    """Create a user with the suite's default test details."""
+    defaults = {'username': email.split('@')[0], 'first_name': 'Test', 'last_name': 'Owner'}
+    defaults.update(fields)
+    return User.objects.create_user(email=email, password=PASSWORD, **defaults)
+
+
+class UserTestCase(TestCase):
+    """
+    TestCase with self.user and an API client, authenticated as that user
+    unless authenticate_client is False.
+    """
+    authenticate_client = True
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        if self.authenticate_client:
+            self.client.force_authenticate(self.user)
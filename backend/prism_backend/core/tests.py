@@ -1,3 +1,190 @@
-from django.test import TestCase
+from unittest.mock import patch
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from . import authentication, tokens
+from .testing import PASSWORD, UserTestCase
+from .throttling import LoginAccountThrottle, LoginIPThrottle, TokenBucketThrottle
+from .models import RevokedToken, User
 
-# Create your tests here.
+
+class ProfileConditionalGetTests(UserTestCase):
+    def test_profile_etag(self):
+        etag = self.client.get('/api/v1/user/profile/')['ETag']
+        response = self.client.get('/api/v1/user/profile/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.client.put('/api/v1/user/profile/update/', {'first_name': 'Renamed'}, format='json')
+        response = self.client.get('/api/v1/user/profile/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['first_name'], 'Renamed')
+
+
+class CachedJWTAuthenticationTests(UserTestCase):
+    def setUp(self):
+        super().setUp()
+        authentication._users.clear()
+        self.header = f'Bearer {AccessToken.for_user(self.user)}'
+        self.factory = APIRequestFactory()
+
+    def authenticate(self, method='get'):
+        request = getattr(self.factory, method)('/api/v1/accounts/', HTTP_AUTHORIZATION=self.header)
+        return authentication.CachedJWTAuthentication().authenticate(request)
+
+    def test_reads_skip_user_query(self):
+        with CaptureQueriesContext(connection) as context:
+            first, _ = self.authenticate()
+            second, _ = self.authenticate()
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertEqual(second.pk, self.user.pk)
+        self.assertIsNot(first, second)
+
+    def test_deactivated_user_rejected_within_ttl(self):
+        self.authenticate()
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        # Writes always check the current row
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate('post')
+
+        self.authenticate()
+        expired = authentication.time.monotonic() + authentication.settings.JWT_USER_CACHE_TTL + 1
+        with patch.object(authentication.time, 'monotonic', return_value=expired):
+            with self.assertRaises(AuthenticationFailed):
+                self.authenticate()
+
+    def test_deleted_user_forgotten_on_delete(self):
+        self.authenticate()
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+
+class LoginPipelineTests(UserTestCase):
+    authenticate_client = False
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        # A fixed clock, so slot boundaries never fall between attempts
+        self.now = 1_000_000.0
+        clock = patch.object(TokenBucketThrottle, 'timer', lambda throttle: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def login(self, email='owner@example.com', password=PASSWORD, **extra):
+        return self.client.post('/api/v1/auth/login/', {'email': email, 'password': password}, format='json', **extra)
+
+    @patch.object(LoginAccountThrottle, 'rate', '3/min', create=True)
+    def test_account_throttled_before_hashing(self):
+        for i in range(3):
+            response = self.login(password='wrong', REMOTE_ADDR=f'10.0.0.{i}')
+            self.assertEqual(response.status_code, 401)
+
+        with patch('prism_backend.core.views.auth.authenticate') as authenticate:
+            response = self.login(REMOTE_ADDR='10.0.0.9')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        authenticate.assert_not_called()
+
+        # Other accounts are unaffected
+        self.assertEqual(self.login(email='other@example.com').status_code, 401)
+
+    @patch.object(LoginIPThrottle, 'rate', '2/min', create=True)
+    def test_ip_bucket_refills(self):
+        self.assertEqual(self.login().status_code, 200)
+        self.assertEqual(self.login(email='other@example.com').status_code, 401)
+        self.assertEqual(self.login().status_code, 429)
+
+        self.now += 30
+        self.assertEqual(self.login().status_code, 200)
+        self.assertEqual(self.login().status_code, 429)
+
+    @patch.object(LoginIPThrottle, 'rate', '2/min', create=True)
+    def test_forwarded_for_cannot_reset_ip_bucket(self):
+        self.login(HTTP_X_FORWARDED_FOR='1.1.1.1')
+        self.login(HTTP_X_FORWARDED_FOR='2.2.2.2')
+        self.assertEqual(self.login(HTTP_X_FORWARDED_FOR='3.3.3.3').status_code, 429)
+
+        # Behind one proxy, only the address it appended identifies the client
+        cache.clear()
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}):
+            self.login(HTTP_X_FORWARDED_FOR='1.1.1.1, 203.0.113.5')
+            self.login(HTTP_X_FORWARDED_FOR='2.2.2.2, 203.0.113.5')
+            self.assertEqual(self.login(HTTP_X_FORWARDED_FOR='3.3.3.3, 203.0.113.5').status_code, 429)
+            self.assertEqual(self.login(HTTP_X_FORWARDED_FOR='203.0.113.6').status_code, 200)
+
+    @patch.object(LoginIPThrottle, 'rate', '2/min', create=True)
+    def test_claimed_slots_survive_lost_hint(self):
+        self.login()
+        self.login()
+        # The last-slot hint is advisory; the claimed slots alone enforce the limit
+        cache.delete(LoginIPThrottle.cache_format % {'scope': 'login_ip', 'ident': '127.0.0.1'})
+        self.assertEqual(self.login().status_code, 429)
+
+    def test_login_upgrades_hash(self):
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
+        with override_settings(PASSWORD_HASHERS=[
+            'prism_backend.core.hashers.ScryptPasswordHasher',
+            'prism_backend.core.hashers.PBKDF2PasswordHasher',
+        ]):
+            self.assertEqual(self.login().status_code, 200)
+            self.user.refresh_from_db()
+            self.assertTrue(self.user.password.startswith('scrypt$'))
+            self.assertEqual(self.login().status_code, 200)
+
+
+class RefreshRotationTests(UserTestCase):
+    authenticate_client = False
+
+    def setUp(self):
+        super().setUp()
+        self.refresh = str(RefreshToken.for_user(self.user))
+
+    def refresh_with(self, token):
+        return self.client.post('/api/v1/auth/refresh/', {'refresh': token}, format='json')
+
+    def test_refresh_rotates_and_rejects_reuse(self):
+        response = self.refresh_with(self.refresh)
+        self.assertEqual(response.status_code, 200)
+        rotated = response.data['refresh']
+        self.assertNotEqual(rotated, self.refresh)
+        self.assertIn('access', response.data)
+
+        self.assertEqual(self.refresh_with(self.refresh).status_code, 401)
+        self.assertEqual(self.refresh_with(rotated).status_code, 200)
+
+    def test_logout_revokes(self):
+        response = self.client.post('/api/v1/auth/logout/', {'refresh': self.refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.refresh_with(self.refresh).status_code, 401)
+
+    def test_inactive_user_cannot_refresh(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.refresh_with(self.refresh).status_code, 401)
+
+    def test_prune_deletes_expired(self):
+        self.refresh_with(self.refresh)
+        expired = RefreshToken.for_user(self.user)
+        expired.set_exp(lifetime=-expired.lifetime)
+        tokens.revoke(expired)
+
+        self.assertEqual(tokens.prune(batch_size=1), 1)
+        self.assertEqual(RevokedToken.objects.count(), 1)
+
+    def test_revoke_prunes_now_and_then(self):
+        expired = RefreshToken.for_user(self.user)
+        expired.set_exp(lifetime=-expired.lifetime)
+        with patch('random.randrange', return_value=1):
+            tokens.revoke(expired)
+        self.assertEqual(RevokedToken.objects.count(), 1)
+
+        with patch('random.randrange', return_value=0):
+            self.assertEqual(self.refresh_with(self.refresh).status_code, 200)
+        self.assertFalse(RevokedToken.objects.filter(jti=expired['jti']).exists())
+        self.assertEqual(RevokedToken.objects.count(), 1)
@@ -0,0 +1,68 @@
+"""
+Token-bucket throttles for the login endpoint.
+
+A bucket holds up to N tokens for a rate of 'N/period' and refills one token
+every period/N seconds; each attempt takes a token. That allows a burst of N
+attempts (a user mistyping a password, an app reconnecting) while bounding
+the sustained rate. Throttles run in APIView.initial(), so an attempt
+turned away here never reaches the password hasher.
+
+The bucket is kept as refill slots in the default cache, which must be
+shared by all workers (see settings.CACHES). Each admitted attempt claims
+the next free slot with cache.add(), which is atomic, and an attempt is
+turned away when every slot up to a full bucket ahead is taken. Concurrent
+attempts therefore never overshoot the limit. Slot boundaries make the
+refill accurate to within one slot.
+"""
+import hashlib
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """SimpleRateThrottle with a token bucket instead of a request history."""
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.interval = self.duration / self.num_requests
+        self.now = self.timer()
+        current = int(self.now // self.interval)
+        last = current + self.num_requests - 1
+
+        # The key holds the last slot claimed, so scanning usually starts at a free one
+        self.slot = max(current, self.cache.get(self.key, current - 1) + 1)
+        while self.slot <= last:
+            if self.cache.add(f'{self.key}:{self.slot}', True, self.duration + self.interval):
+                self.cache.set(self.key, self.slot, self.duration + self.interval)
+                return True
+            self.slot += 1
+        return False
+
+    def wait(self):
+        """Seconds until the next slot comes within a full bucket of now."""
+        return max(0, (self.slot - self.num_requests + 1) * self.interval - self.now)
+
+
+class LoginIPThrottle(TokenBucketThrottle):
+    """Login attempts per client IP."""
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginAccountThrottle(TokenBucketThrottle):
+    """Login attempts per account, whichever IPs they come from."""
+    scope = 'login_account'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email') if isinstance(request.data, dict) else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        digest = hashlib.md5(email.strip().lower().encode(), usedforsecurity=False).hexdigest()
+        return self.cache_format % {'scope': self.scope, 'ident': digest}
@@ -0,0 +1,71 @@
+"""
+Refresh token rotation and revocation.
+
+Every refresh token can be used once: refreshing revokes the presented
+token and hands out a new one with a fresh JTI and lifetime. A revoked
+token is a RevokedToken row keyed on its JTI, so both the reuse check and
+the revocation are the same single primary-key INSERT, which also makes
+two concurrent refreshes with one token race safely. Rows are only kept
+until the token would have expired, so prune() keeps the table at roughly
+one day's worth of refreshes. revoke() runs a small prune every
+PRUNE_EVERY revocations on average, so this holds without scheduling the
+prune_revoked_tokens command.
+"""
+import random
+from datetime import datetime, timezone as dt_timezone
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from .models import RevokedToken
+
+# Each revocation prunes with probability 1/PRUNE_EVERY. A prune can remove
+# far more rows than PRUNE_EVERY revocations add, so expired rows never pile up.
+PRUNE_EVERY = 100
+PRUNE_BATCH_SIZE = 1000
+
+
+def revoke(token):
+    """Revoke a refresh token. Returns False if it was already revoked."""
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(
+                jti=token[api_settings.JTI_CLAIM],
+                expires_at=datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc),
+            )
+    except IntegrityError:
+        return False
+
+    if random.randrange(PRUNE_EVERY) == 0:
+        prune(batch_size=PRUNE_BATCH_SIZE, max_batches=1)
+    return True
+
+
+def rotate(refresh):
+    """
+    Revoke refresh and turn it into its successor for the same user.
+    Returns None when refresh had already been used.
+    """
+    if not revoke(refresh):
+        return None
+    refresh.set_jti()
+    refresh.set_exp()
+    refresh.set_iat()
+    return refresh
+
+
+def prune(batch_size=5000, max_batches=None):
+    """
+    Delete revoked tokens past their expiry in batches, stopping after
+    max_batches if given. Returns the number deleted.
+    """
+    now = timezone.now()
+    deleted = batches = 0
+    while max_batches is None or batches < max_batches:
+        batch = list(
+            RevokedToken.objects.filter(expires_at__lt=now).values_list('pk', flat=True)[:batch_size]
+        )
+        if not batch:
+            break
+        deleted += RevokedToken.objects.filter(pk__in=batch).delete()[0]
+        batches += 1
+    return deleted
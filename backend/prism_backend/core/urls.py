@@ -8,6 +8,7 @@ urlpatterns = [
     path('auth/register/', auth.register, name='register'),
     path('auth/login/', auth.login, name='login'),
     path('auth/refresh/', auth.refresh_token, name='refresh_token'),
+    path('auth/logout/', auth.logout, name='logout'),
 
     # User profile endpoints
     path('user/profile/', user.profile, name='profile'),
@@ -1,11 +1,15 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
+from .. import tokens
 from ..models import User
 from ..serializers import UserRegistrationSerializer, UserSerializer
+from ..throttling import LoginAccountThrottle, LoginIPThrottle
 
 
 @api_view(['POST'])
@@ -42,9 +46,13 @@ def register(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginIPThrottle, LoginAccountThrottle])
 def login(request):
     """
     Authenticate user and return JWT tokens.
+    Attempts are throttled per IP and per account before any password is
+    hashed; a successful login upgrades the stored hash to the preferred
+    hasher and costs.
     """
     try:
         email = request.data.get('email')
@@ -90,7 +98,8 @@ def login(request):
 @permission_classes([AllowAny])
 def refresh_token(request):
     """
-    Refresh JWT access token using refresh token.
+    Exchange a refresh token for a new access token and refresh token.
+    The presented refresh token is revoked, so each can be used only once.
     """
     try:
         refresh_token = request.data.get('refresh')
@@ -102,13 +111,49 @@ def refresh_token(request):
             )
 
         refresh = RefreshToken(refresh_token)
+        user_id = refresh[jwt_settings.USER_ID_CLAIM]
+        if not User.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}, is_active=True).exists():
+            raise TokenError('User not found')
+
+        refresh = tokens.rotate(refresh)
+        if refresh is None:
+            raise TokenError('Token has been revoked')
 
         return Response({
             'access': str(refresh.access_token),
+            'refresh': str(refresh),
         }, status=status.HTTP_200_OK)
 
     except Exception as e:
         return Response(
             {'error': 'Invalid refresh token'},
             status=status.HTTP_401_UNAUTHORIZED
-        )
\ No newline at end of file
+        )
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def logout(request):
+    """
+    Revoke a refresh token.
+    """
+    refresh_token = request.data.get('refresh')
+
+    if not refresh_token:
+        return Response(
+            {'error': 'Refresh token is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        tokens.revoke(RefreshToken(refresh_token))
+    except TokenError:
+        return Response(
+            {'error': 'Invalid refresh token'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+
+    return Response(
+        {'message': 'Logged out successfully'},
+        status=status.HTTP_200_OK
+    )
@@ -3,6 +3,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.contrib.auth import update_session_auth_hash
+from ..conditional import etag_matches, make_etag, not_modified, set_etag
 from ..models import User
 from ..serializers import UserSerializer, UserProfileSerializer, PasswordChangeSerializer
 
@@ -12,9 +13,15 @@ from ..serializers import UserSerializer, UserProfileSerializer, PasswordChangeS
 def profile(request):
     """
     Get current user profile information.
+    Supports If-None-Match with an ETag derived from the user row.
     """
-    serializer = UserSerializer(request.user)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    user = request.user
+    etag = make_etag(user.pk, user.updated_at.isoformat(), user.last_login, request.accepted_media_type)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    serializer = UserSerializer(user)
+    return set_etag(Response(serializer.data, status=status.HTTP_200_OK), etag)
 
 
 @api_view(['PUT'])
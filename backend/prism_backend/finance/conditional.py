@@ -0,0 +1,52 @@
+from datetime import date
+from prism_backend.core.conditional import etag_matches, make_etag, not_modified, set_etag
+from .services import response_cache
+
+
+class NotModified(Exception):
+    """Raised from initial() to skip the handler when the client's copy is current."""
+
+    def __init__(self, etag):
+        super().__init__(etag)
+        self.etag = etag
+
+
+class ConditionalGetMixin:
+    """
+    Strong ETags for every GET action of a viewset.
+
+    The tag combines the user's finance cache version (bumped on every write,
+    see services.response_cache), the user row itself, today's date for
+    date-relative endpoints, the negotiated media type and the full URL.
+    A matching If-None-Match returns 304 before the handler runs.
+    """
+    etag = None
+
+    def get_etag(self, request):
+        user = request.user
+        return make_etag(
+            user.pk,
+            response_cache.get_version(user.pk),
+            user.updated_at.isoformat(),
+            date.today().isoformat(),
+            request.accepted_media_type,
+            request.get_full_path(),
+        )
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method == 'GET':
+            self.etag = self.get_etag(request)
+            if etag_matches(request, self.etag):
+                raise NotModified(self.etag)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return not_modified(exc.etag)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.etag and response.status_code == 200 and not response.has_header('ETag'):
+            set_etag(response, self.etag)
+        return response
@@ -0,0 +1,16 @@
+from datetime import datetime
+
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD query parameter, returning None if absent or invalid."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+def date_range(query_params):
+    """Return the (start_date, end_date) pair from request query parameters."""
+    return parse_date(query_params.get('start_date')), parse_date(query_params.get('end_date'))
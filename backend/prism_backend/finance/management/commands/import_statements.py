@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from prism_backend.core.models import User
+from prism_backend.finance.models import Account
+from prism_backend.finance.services import statements
+
+
+class Command(BaseCommand):
+    help = 'Import CSV or OFX bank statements into an account, skipping duplicates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='+', help='Statement files to import')
+        parser.add_argument('--user', required=True, help='Owner of the account (email)')
+        parser.add_argument('--account', type=int, required=True, help='Account ID to import into')
+        parser.add_argument('--format', choices=['csv', 'ofx'], help='Defaults to the file extension')
+        parser.add_argument('--date-format', help='strptime format for dates, e.g. %%m/%%d/%%Y')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--encoding', default='utf-8-sig')
+
+    def handle(self, *args, **options):
+        try:
+            owner = User.objects.get(email=options['user'])
+            account = Account.objects.get(id=options['account'], owner=owner)
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist")
+        except Account.DoesNotExist:
+            raise CommandError(f"Account {options['account']} not found for '{options['user']}'")
+
+        for path in options['files']:
+            file_format = options['format'] or statements.detect_format(path)
+            try:
+                with open(path, encoding=options['encoding'], newline='') as lines:
+                    report = statements.import_statement(
+                        lines,
+                        owner,
+                        account,
+                        file_format=file_format,
+                        batch_size=options['batch_size'],
+                        date_format=options['date_format'],
+                    )
+            except (OSError, statements.StatementError) as e:
+                raise CommandError(f'{path}: {e}')
+
+            for error in report['errors']:
+                self.stderr.write(f"{path}:{error['line']}: {error['error']}")
+
+            self.stdout.write(self.style.SUCCESS(
+                f"{path}: {report['rows']} rows, {report['created']} created, "
+                f"{report['duplicates']} duplicates, {report['invalid']} invalid "
+                f"in {report['seconds']}s ({report['rows_per_second']} rows/s)"
+            ))
@@ -0,0 +1,34 @@
+import time
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from prism_backend.finance.services import recurring
+
+
+class Command(BaseCommand):
+    help = 'Create the due occurrences of recurring transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Materialize occurrences up to this date (YYYY-MM-DD, default today)')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--interval',
+            type=int,
+            help='Keep running as a worker, scanning again every INTERVAL seconds',
+        )
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError(f"Invalid date '{options['date']}', expected YYYY-MM-DD")
+
+        while True:
+            stats = recurring.materialize_due(today, batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f"Processed {stats['templates']} templates, created {stats['created']} transactions"
+            ))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
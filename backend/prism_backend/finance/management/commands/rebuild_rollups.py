@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from prism_backend.core.models import User
+from prism_backend.finance.services import rollup
+
+
+class Command(BaseCommand):
+    help = 'Rebuild or verify the daily spending rollups from raw transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Only compare rollups with transactions and report drift',
+        )
+        parser.add_argument('--user', help='Limit to a single user (email)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        owner = None
+        if options['user']:
+            try:
+                owner = User.objects.get(email=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' does not exist")
+
+        if options['verify']:
+            mismatches = rollup.verify(owner=owner)
+            for key, expected, actual in mismatches:
+                self.stdout.write(f"{key}: expected {expected}, found {actual}")
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} rollup rows are out of date")
+            self.stdout.write(self.style.SUCCESS('Rollups match transactions'))
+            return
+
+        written = rollup.rebuild(owner=owner, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} rollup rows'))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+from prism_backend.core.models import User
+from prism_backend.finance.models import Account
+from prism_backend.finance.services import ledger
+
+
+class Command(BaseCommand):
+    help = 'Recompute account balances from the transaction ledger and report drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drift without correcting balances',
+        )
+        parser.add_argument('--user', help='Limit to a single user (email)')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        accounts = Account.objects.all()
+        if options['user']:
+            try:
+                accounts = accounts.filter(owner=User.objects.get(email=options['user']))
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' does not exist")
+
+        drifted = ledger.reconcile(
+            accounts,
+            dry_run=options['dry_run'],
+            batch_size=options['batch_size'],
+        )
+
+        for account, balance, ledger_balance in drifted:
+            self.stdout.write(
+                f"Account {account.pk} ({account.name}): stored {balance}, "
+                f"ledger {ledger_balance}, drift {balance - ledger_balance}"
+            )
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('All balances match the ledger'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{len(drifted)} accounts have drifted'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Corrected {len(drifted)} accounts'))
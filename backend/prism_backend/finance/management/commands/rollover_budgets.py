@@ -0,0 +1,32 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from prism_backend.core.models import User
+from prism_backend.finance.models import Budget
+from prism_backend.finance.services import budget_rollover
+
+
+class Command(BaseCommand):
+    help = 'Create the next period for every active budget whose period has ended'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Limit to a single user (email)')
+        parser.add_argument('--date', help='Roll over budgets ended before this date (YYYY-MM-DD, default today)')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        budgets = Budget.objects.all()
+        if options['user']:
+            try:
+                budgets = budgets.filter(owner=User.objects.get(email=options['user']))
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' does not exist")
+
+        today = None
+        if options['date']:
+            try:
+                today = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError(f"Invalid date '{options['date']}', expected YYYY-MM-DD")
+
+        created = budget_rollover.rollover(budgets, today=today, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Created {len(created)} budgets'))
@@ -0,0 +1,67 @@
+# Generated by Django 5.1.1 on 2026-10-17 06:00
+
+import django.db.models.deletion
+from django.conf import settings
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def populate_rollups(apps, schema_editor):
+    Transaction = apps.get_model('finance', 'Transaction')
+    DailyRollup = apps.get_model('finance', 'DailyRollup')
+
+    rows = (
+        Transaction.objects.order_by()
+        .values('owner_id', 'category_id', 'account_id', 'date')
+        .annotate(
+            income=Sum('amount', filter=Q(amount__gt=0)),
+            expense=Sum('amount', filter=Q(amount__lt=0)),
+            count=Count('id'),
+        )
+    )
+    DailyRollup.objects.bulk_create(
+        (
+            DailyRollup(
+                owner_id=row['owner_id'],
+                category_id=row['category_id'],
+                account_id=row['account_id'],
+                day=row['date'],
+                income_total=row['income'] or Decimal('0.00'),
+                expense_total=abs(row['expense'] or Decimal('0.00')),
+                transaction_count=row['count'],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('income_total', models.DecimalField(decimal_places=2, default=0.0, max_digits=14)),
+                ('expense_total', models.DecimalField(decimal_places=2, default=0.0, max_digits=14)),
+                ('transaction_count', models.IntegerField(default=0)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='finance.account')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_rollups', to='finance.category')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['owner', 'day'], name='finance_dai_owner_i_824151_idx'), models.Index(fields=['owner', 'category', 'day'], name='finance_dai_owner_i_0a554b_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('category__isnull', False)), fields=('owner', 'category', 'account', 'day'), name='unique_daily_rollup'), models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('owner', 'account', 'day'), name='unique_uncategorized_daily_rollup')],
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.1 on 2026-10-17 06:02
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def derive_opening_balances(apps, schema_editor):
+    """
+    Existing balances were never touched by transactions, so keep them as
+    they are and back out the ledger to find the opening balance.
+    """
+    Account = apps.get_model('finance', 'Account')
+    Transaction = apps.get_model('finance', 'Transaction')
+
+    posted = dict(
+        Transaction.objects.order_by().values('account_id')
+        .annotate(total=Sum('amount')).values_list('account_id', 'total')
+    )
+    transferred_in = dict(
+        Transaction.objects.filter(transfer_to__isnull=False).order_by().values('transfer_to_id')
+        .annotate(total=Sum('amount')).values_list('transfer_to_id', 'total')
+    )
+
+    accounts = list(Account.objects.all())
+    for account in accounts:
+        ledger = posted.get(account.pk, Decimal('0.00')) - transferred_in.get(account.pk, Decimal('0.00'))
+        account.opening_balance = account.balance - ledger
+    Account.objects.bulk_update(accounts, ['opening_balance'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0002_daily_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='opening_balance',
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=12),
+        ),
+        migrations.RunPython(derive_opening_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.1 on 2026-10-17 06:03
+
+import hashlib
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_import_hashes(apps, schema_editor):
+    # Mirrors finance.models.transaction.import_hash at the time of writing
+    Transaction = apps.get_model('finance', 'Transaction')
+
+    batch = []
+    for txn in Transaction.objects.only('owner_id', 'account_id', 'date', 'amount', 'description').iterator(chunk_size=1000):
+        key = '|'.join([
+            str(txn.owner_id),
+            str(txn.account_id),
+            txn.date.isoformat(),
+            str(Decimal(txn.amount).quantize(Decimal('0.01'))),
+            ' '.join(txn.description.split()).lower(),
+        ])
+        txn.import_hash = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        batch.append(txn)
+        if len(batch) >= 1000:
+            Transaction.objects.bulk_update(batch, ['import_hash'])
+            batch = []
+    if batch:
+        Transaction.objects.bulk_update(batch, ['import_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0003_account_opening_balance'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='import_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['owner', 'import_hash'], name='finance_tra_owner_i_38b7e7_idx'),
+        ),
+        migrations.RunPython(backfill_import_hashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.1.1 on 2026-10-17 06:16
+
+import calendar
+from datetime import date, timedelta
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def _next(day, frequency, anchor_day):
+    # Mirrors finance.services.recurring.next_occurrence at the time of writing
+    if frequency == 'daily':
+        return day + timedelta(days=1)
+    if frequency == 'weekly':
+        return day + timedelta(weeks=1)
+    months = 1 if frequency == 'monthly' else 12
+    month = day.month - 1 + months
+    year, month = day.year + month // 12, month % 12 + 1
+    return date(year, month, min(anchor_day, calendar.monthrange(year, month)[1]))
+
+
+def schedule_existing_templates(apps, schema_editor):
+    # Existing templates start at their first occurrence from today on;
+    # past occurrences were only ever projected by clients, never stored
+    Transaction = apps.get_model('finance', 'Transaction')
+    today = date.today()
+
+    batch = []
+    templates = Transaction.objects.filter(
+        is_recurring=True,
+        recurring_frequency__in=['daily', 'weekly', 'monthly', 'yearly']
+    ).only('date', 'recurring_frequency')
+    for template in templates.iterator(chunk_size=1000):
+        day = _next(template.date, template.recurring_frequency, template.date.day)
+        if day < today:
+            if template.recurring_frequency == 'daily':
+                day = today
+            elif template.recurring_frequency == 'weekly':
+                day += timedelta(weeks=-(-(today - day).days // 7))
+            while day < today:
+                day = _next(day, template.recurring_frequency, template.date.day)
+        template.next_run_date = day
+        batch.append(template)
+        if len(batch) >= 1000:
+            Transaction.objects.bulk_update(batch, ['next_run_date'])
+            batch = []
+    if batch:
+        Transaction.objects.bulk_update(batch, ['next_run_date'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0006_sync_tombstones'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='next_run_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='recurring_parent',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='occurrences', to='finance.transaction'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(('is_recurring', True)), fields=['next_run_date'], name='finance_txn_next_run_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='transaction',
+            constraint=models.UniqueConstraint(condition=models.Q(('recurring_parent__isnull', False)), fields=('recurring_parent', 'date'), name='finance_txn_unique_occurrence'),
+        ),
+        migrations.RunPython(schedule_existing_templates, migrations.RunPython.noop),
+    ]
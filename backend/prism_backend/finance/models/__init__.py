@@ -3,5 +3,7 @@ from .category import Category
 from .transaction import Transaction
 from .budget import Budget
 from .goal import Goal
+from .rollup import DailyRollup
+from .tombstone import Tombstone
 
-__all__ = ['Account', 'Category', 'Transaction', 'Budget', 'Goal']
\ No newline at end of file
+__all__ = ['Account', 'Category', 'Transaction', 'Budget', 'Goal', 'DailyRollup', 'Tombstone']
\ No newline at end of file
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 
 
@@ -6,6 +6,7 @@ class Account(models.Model):
     """
     Financial accounts (checking, savings, credit cards, etc.)
     All accounts are owned by a specific user.
+    The balance is maintained by transaction writes (see services.ledger).
     """
     ACCOUNT_TYPES = [
         ('checking', 'Checking'),
@@ -25,6 +26,8 @@ class Account(models.Model):
     name = models.CharField(max_length=100)
     account_type = models.CharField(max_length=20, choices=ACCOUNT_TYPES)
     balance = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    # Balance before any recorded transactions; balance = opening + ledger
+    opening_balance = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -32,6 +35,50 @@ class Account(models.Model):
     class Meta:
         ordering = ['name']
         unique_together = ['owner', 'name']
+        indexes = [
+            models.Index(fields=['owner', 'updated_at']),
+        ]
 
     def __str__(self):
-        return f"{self.name} ({self.get_account_type_display()})"
\ No newline at end of file
+        return f"{self.name} ({self.get_account_type_display()})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_balance = instance.__dict__.get('balance')
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            # New accounts have no history, so their balance is the opening balance
+            self.opening_balance = self.balance
+            super().save(*args, **kwargs)
+            return
+
+        with transaction.atomic():
+            current = Account.objects.select_for_update().values(
+                'balance', 'opening_balance'
+            ).get(pk=self.pk)
+
+            if self.balance != getattr(self, '_loaded_balance', current['balance']):
+                # Manual balance edit: keep the ledger consistent by moving the opening balance
+                self.opening_balance = current['opening_balance'] + (self.balance - current['balance'])
+            else:
+                # Don't overwrite increments made by transactions since this row was loaded
+                self.balance = current['balance']
+                self.opening_balance = current['opening_balance']
+
+            super().save(*args, **kwargs)
+            self._loaded_balance = self.balance
+
+    def adjust_balance(self, balance):
+        """
+        Set the balance to a reconciled figure. The opening balance moves by
+        the difference, so the ledger still adds up.
+        """
+        with transaction.atomic():
+            self._loaded_balance = Account.objects.select_for_update().values_list(
+                'balance', flat=True
+            ).get(pk=self.pk)
+            self.balance = balance
+            self.save()
\ No newline at end of file
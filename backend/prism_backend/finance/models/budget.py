@@ -1,7 +1,67 @@
 from django.db import models
+from django.db.models import Case, F, FloatField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.lookups import Exact
+from django.db.models.functions import Cast, Coalesce, Greatest, Least
 from django.conf import settings
 from decimal import Decimal
 
+SPENDING_ANNOTATIONS = (
+    'annotated_spent',
+    'annotated_remaining',
+    'annotated_percentage',
+    'annotated_over_budget',
+)
+
+
+class BudgetQuerySet(models.QuerySet):
+    """
+    QuerySet with database-side spending calculations for budgets.
+    """
+
+    def with_spending(self):
+        """
+        Annotate spent, remaining, percentage used and over-budget flag.
+
+        Spending is aggregated per budget from the daily rollups in a single
+        correlated subquery, so the number of queries does not grow with the
+        number of budgets or transactions. Budgets that include subcategories
+        match rollups by category path prefix.
+        """
+        from .rollup import DailyRollup
+
+        expenses = DailyRollup.objects.filter(
+            Q(category=OuterRef('category'))
+            | Q(
+                Exact(OuterRef('include_subcategories'), True),
+                category__path__startswith=OuterRef('category__path'),
+            ),
+            owner=OuterRef('owner'),
+            day__gte=OuterRef('start_date'),
+            day__lte=OuterRef('end_date'),
+        ).order_by().values('owner').annotate(total=Sum('expense_total')).values('total')
+
+        decimal_field = models.DecimalField(max_digits=12, decimal_places=2)
+        zero = Value(Decimal('0.00'), output_field=decimal_field)
+
+        return self.annotate(
+            annotated_spent=Coalesce(Subquery(expenses, output_field=decimal_field), zero),
+        ).annotate(
+            annotated_remaining=Greatest(F('amount') - F('annotated_spent'), zero, output_field=decimal_field),
+            annotated_percentage=Case(
+                When(amount=0, then=Value(0.0)),
+                default=Least(
+                    Value(100.0),
+                    Cast('annotated_spent', FloatField()) * 100 / Cast('amount', FloatField()),
+                ),
+                output_field=FloatField(),
+            ),
+            annotated_over_budget=Case(
+                When(annotated_spent__gt=F('amount'), then=Value(True)),
+                default=Value(False),
+                output_field=models.BooleanField(),
+            ),
+        )
+
 
 class Budget(models.Model):
     """
@@ -29,13 +89,27 @@ class Budget(models.Model):
     period = models.CharField(max_length=10, choices=PERIOD_CHOICES, default='monthly')
     start_date = models.DateField()
     end_date = models.DateField()
+    # Count spending in subcategories of the budget's category as well
+    include_subcategories = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
+    # Set once the rollover engine has handled the period after this one
+    rolled_over = models.BooleanField(default=False, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = BudgetQuerySet.as_manager()
+
     class Meta:
         ordering = ['-start_date']
         unique_together = ['owner', 'category', 'start_date', 'end_date']
+        indexes = [
+            models.Index(fields=['owner', 'updated_at']),
+            models.Index(
+                fields=['end_date'],
+                name='finance_budget_rollover_idx',
+                condition=Q(is_active=True, rolled_over=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.category.name} ({self.period})"
@@ -43,24 +117,34 @@ class Budget(models.Model):
     @property
     def spent_amount(self):
         """Calculate total spent in this budget's category and time period"""
-        from .transaction import Transaction
-        transactions = Transaction.objects.filter(
+        if hasattr(self, 'annotated_spent'):
+            return self.annotated_spent
+
+        from .rollup import DailyRollup
+        if self.include_subcategories:
+            categories = Q(category__path__startswith=self.category.path)
+        else:
+            categories = Q(category=self.category)
+        total = DailyRollup.objects.filter(
+            categories,
             owner=self.owner,
-            category=self.category,
-            date__gte=self.start_date,
-            date__lte=self.end_date,
-            amount__lt=0  # Only expenses (negative amounts)
-        )
-        return abs(sum(t.amount for t in transactions) or Decimal('0.00'))
+            day__gte=self.start_date,
+            day__lte=self.end_date,
+        ).aggregate(total=Sum('expense_total'))['total']
+        return total or Decimal('0.00')
 
     @property
     def remaining_amount(self):
         """Calculate remaining budget amount"""
+        if hasattr(self, 'annotated_remaining'):
+            return self.annotated_remaining
         return max(Decimal('0.00'), self.amount - self.spent_amount)
 
     @property
     def percentage_used(self):
         """Calculate percentage of budget used"""
+        if hasattr(self, 'annotated_percentage'):
+            return self.annotated_percentage
         if self.amount == 0:
             return 0
         return min(100, (self.spent_amount / self.amount) * 100)
@@ -68,6 +152,8 @@ class Budget(models.Model):
     @property
     def is_over_budget(self):
         """Check if spending exceeds budget"""
+        if hasattr(self, 'annotated_over_budget'):
+            return self.annotated_over_budget
         return self.spent_amount > self.amount
 
     def save(self, *args, **kwargs):
@@ -79,4 +165,8 @@ class Budget(models.Model):
         if self.end_date <= self.start_date:
             raise ValueError("End date must be after start date")
 
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+        # Spending annotations describe the row as it was loaded
+        for attr in SPENDING_ANNOTATIONS:
+            self.__dict__.pop(attr, None)
\ No newline at end of file
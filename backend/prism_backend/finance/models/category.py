@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Value
+from django.db.models.functions import Concat, Substr
 from django.conf import settings
+from django.utils import timezone
 
 
 class Category(models.Model):
@@ -27,6 +30,8 @@ class Category(models.Model):
         blank=True,
         related_name='subcategories'
     )
+    # Materialized path of ancestor ids including this one, e.g. "/3/17/42/"
+    path = models.CharField(max_length=255, blank=True, editable=False)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -35,6 +40,14 @@ class Category(models.Model):
         ordering = ['name']
         unique_together = ['owner', 'name', 'parent']
         verbose_name_plural = 'categories'
+        indexes = [
+            models.Index(
+                fields=['owner', 'path'],
+                name='finance_category_path_idx',
+                opclasses=['int8_ops', 'varchar_pattern_ops'],
+            ),
+            models.Index(fields=['owner', 'updated_at']),
+        ]
 
     def __str__(self):
         if self.parent:
@@ -45,4 +58,47 @@ class Category(models.Model):
     def full_name(self):
         if self.parent:
             return f"{self.parent.name} > {self.name}"
-        return self.name
\ No newline at end of file
+        return self.name
+
+    def is_ancestor_of(self, other):
+        """True if other sits anywhere below this category."""
+        return bool(self.path) and other.path.startswith(self.path) and other.pk != self.pk
+
+    def descendants(self, include_self=True):
+        """All categories below this one, found with one indexed prefix query."""
+        queryset = Category.objects.filter(owner_id=self.owner_id, path__startswith=self.path)
+        if not include_self:
+            queryset = queryset.exclude(pk=self.pk)
+        return queryset
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            old_path = ''
+            if self.pk:
+                old_path = Category.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values_list('path', flat=True).first() or ''
+
+            parent_path = '/'
+            if self.parent_id:
+                parent_path = Category.objects.filter(
+                    pk=self.parent_id
+                ).values_list('path', flat=True).get()
+                if old_path and parent_path.startswith(old_path):
+                    raise ValueError("Category cannot be moved below itself")
+
+            super().save(*args, **kwargs)
+
+            new_path = f"{parent_path}{self.pk}/"
+            if new_path != old_path:
+                Category.objects.filter(pk=self.pk).update(path=new_path)
+                if old_path:
+                    # Re-root the whole subtree in a single UPDATE
+                    Category.objects.filter(
+                        owner_id=self.owner_id,
+                        path__startswith=old_path
+                    ).exclude(pk=self.pk).update(
+                        path=Concat(Value(new_path), Substr('path', len(old_path) + 1)),
+                        updated_at=timezone.now()
+                    )
+            self.path = new_path
\ No newline at end of file
@@ -1,7 +1,30 @@
 from django.db import models
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast, Least
 from django.conf import settings
 from decimal import Decimal
 
+PROGRESS_ANNOTATIONS = ('annotated_progress',)
+
+
+class GoalQuerySet(models.QuerySet):
+    """
+    QuerySet with database-side progress calculations for goals.
+    """
+
+    def with_progress(self):
+        """Annotate progress as a percentage of the target, capped at 100."""
+        return self.annotate(
+            annotated_progress=Case(
+                When(target_amount=0, then=Value(0.0)),
+                default=Least(
+                    Value(100.0),
+                    Cast('current_amount', FloatField()) * 100 / Cast(F('target_amount'), FloatField()),
+                ),
+                output_field=FloatField(),
+            )
+        )
+
 
 class Goal(models.Model):
     """
@@ -44,8 +67,13 @@ class Goal(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = GoalQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['owner', 'updated_at']),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.current_amount}/{self.target_amount}"
@@ -58,6 +86,8 @@ class Goal(models.Model):
     @property
     def progress_percentage(self):
         """Calculate progress as percentage"""
+        if hasattr(self, 'annotated_progress'):
+            return self.annotated_progress
         if self.target_amount == 0:
             return 0
         return min(100, (self.current_amount / self.target_amount) * 100)
@@ -83,8 +113,8 @@ class Goal(models.Model):
         self.save()
 
     def save(self, *args, **kwargs):
-        # Ensure owner consistency
-        if self.linked_account and self.linked_account.owner != self.owner:
+        # Ensure owner consistency (compares ids, so the owner is never fetched)
+        if self.linked_account and self.linked_account.owner_id != self.owner_id:
             raise ValueError("Linked account must belong to the same owner")
 
         # Auto-complete goal if target is reached
@@ -94,4 +124,8 @@ class Goal(models.Model):
                 from django.utils import timezone
                 self.completed_at = timezone.now()
 
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+        # Progress annotations describe the row as it was loaded
+        for attr in PROGRESS_ANNOTATIONS:
+            self.__dict__.pop(attr, None)
\ No newline at end of file
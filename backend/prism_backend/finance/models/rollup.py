@@ -0,0 +1,57 @@
+from django.db import models
+from django.conf import settings
+
+
+class DailyRollup(models.Model):
+    """
+    Per-day spending totals for an (owner, category, account) combination.
+    Maintained incrementally from transaction writes so reports can scan
+    one row per day instead of every transaction.
+
+    There is one row per key. Deleting a category folds its rows into the
+    uncategorized ones (see rollup.fold_category).
+    """
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='daily_rollups'
+    )
+    category = models.ForeignKey(
+        'Category',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='daily_rollups'
+    )
+    account = models.ForeignKey(
+        'Account',
+        on_delete=models.CASCADE,
+        related_name='daily_rollups'
+    )
+    day = models.DateField()
+    income_total = models.DecimalField(max_digits=14, decimal_places=2, default=0.00)
+    expense_total = models.DecimalField(max_digits=14, decimal_places=2, default=0.00)  # Positive magnitude
+    transaction_count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['-day']
+        indexes = [
+            models.Index(fields=['owner', 'day']),
+            models.Index(fields=['owner', 'category', 'day']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['owner', 'category', 'account', 'day'],
+                condition=models.Q(category__isnull=False),
+                name='unique_daily_rollup',
+            ),
+            # NULLs never compare equal in a unique index, so uncategorized rows need their own
+            models.UniqueConstraint(
+                fields=['owner', 'account', 'day'],
+                condition=models.Q(category__isnull=True),
+                name='unique_uncategorized_daily_rollup',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day}: +{self.income_total} / -{self.expense_total} ({self.transaction_count})"
@@ -0,0 +1,35 @@
+from django.db import models
+from django.conf import settings
+from django.utils import timezone
+
+
+class Tombstone(models.Model):
+    """
+    Marker left behind when a finance record is deleted, so sync clients
+    can drop their local copy. Only the model name and id are kept.
+    """
+    MODEL_CHOICES = [
+        ('account', 'Account'),
+        ('category', 'Category'),
+        ('transaction', 'Transaction'),
+        ('budget', 'Budget'),
+        ('goal', 'Goal'),
+    ]
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='tombstones'
+    )
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['owner', 'deleted_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} deleted {self.deleted_at}"
@@ -1,6 +1,21 @@
-from django.db import models
+from django.db import models, transaction as db_transaction
 from django.conf import settings
 from decimal import Decimal
+import hashlib
+
+
+def import_hash(owner_id, account_id, date, amount, description):
+    """
+    Fingerprint used to detect the same statement line being imported twice.
+    """
+    key = '|'.join([
+        str(owner_id),
+        str(account_id),
+        date.isoformat(),
+        str(Decimal(amount).quantize(Decimal('0.01'))),
+        ' '.join(description.split()).lower(),
+    ])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
 
 
 class Transaction(models.Model):
@@ -52,6 +67,19 @@ class Transaction(models.Model):
         null=True,
         blank=True
     )
+    # Date of the next occurrence the scheduler should create from this template
+    next_run_date = models.DateField(null=True, blank=True, editable=False)
+    recurring_parent = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='occurrences'
+    )
+
+    # Deduplication fingerprint of (owner, account, date, amount, description)
+    import_hash = models.CharField(max_length=64, blank=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -62,6 +90,21 @@ class Transaction(models.Model):
             models.Index(fields=['owner', 'date']),
             models.Index(fields=['owner', 'account']),
             models.Index(fields=['owner', 'category']),
+            models.Index(fields=['owner', 'import_hash']),
+            models.Index(fields=['owner', 'updated_at']),
+            models.Index(
+                fields=['next_run_date'],
+                name='finance_txn_next_run_idx',
+                condition=models.Q(is_recurring=True),
+            ),
+        ]
+        constraints = [
+            # One occurrence per template and date, so the scheduler can be re-run safely
+            models.UniqueConstraint(
+                fields=['recurring_parent', 'date'],
+                name='finance_txn_unique_occurrence',
+                condition=models.Q(recurring_parent__isnull=False),
+            ),
         ]
 
     def __str__(self):
@@ -79,13 +122,37 @@ class Transaction(models.Model):
     def is_transfer(self):
         return self.transfer_to is not None
 
-    def save(self, *args, **kwargs):
-        # Ensure owner consistency
-        if self.account and self.account.owner != self.owner:
+    def compute_import_hash(self):
+        return import_hash(self.owner_id, self.account_id, self.date, self.amount, self.description)
+
+    def check_owner_consistency(self):
+        """Ensure related accounts and category belong to the transaction owner."""
+        if self.account and self.account.owner_id != self.owner_id:
             raise ValueError("Transaction account must belong to the same owner")
-        if self.category and self.category.owner != self.owner:
+        if self.category and self.category.owner_id != self.owner_id:
             raise ValueError("Transaction category must belong to the same owner")
-        if self.transfer_to and self.transfer_to.owner != self.owner:
+        if self.transfer_to and self.transfer_to.owner_id != self.owner_id:
             raise ValueError("Transfer account must belong to the same owner")
 
-        super().save(*args, **kwargs)
\ No newline at end of file
+    def save(self, *args, **kwargs):
+        # Ensure owner consistency
+        self.check_owner_consistency()
+        self.import_hash = self.compute_import_hash()
+
+        from ..services import ledger, recurring, rollup
+
+        with db_transaction.atomic():
+            previous = None
+            if self.pk:
+                previous = (
+                    Transaction.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values(*rollup.ROLLUP_FIELDS, *ledger.LEDGER_FIELDS, *recurring.SCHEDULE_FIELDS)
+                    .first()
+                )
+
+            recurring.schedule(previous, self)
+            super().save(*args, **kwargs)
+
+            rollup.record_change(previous, self)
+            ledger.record_change(previous, self)
\ No newline at end of file
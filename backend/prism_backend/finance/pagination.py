@@ -0,0 +1,91 @@
+import base64
+import json
+from datetime import date, datetime
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class TransactionPagination(PageNumberPagination):
+    """
+    Page-number pagination with opt-in keyset pagination.
+
+    Passing ``?cursor=`` (empty for the first page) switches to keyset mode:
+    pages are ordered by (-date, -created_at, -id) and fetched by seeking
+    past the last row of the previous page, so deep pages cost the same as
+    the first one and no COUNT(*) is issued.
+    """
+    cursor_query_param = 'cursor'
+    keyset_ordering = ('-date', '-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request.query_params[self.cursor_query_param])
+
+        queryset = queryset.order_by(*self.keyset_ordering)
+        if position is not None:
+            day, created_at, pk = position
+            queryset = queryset.filter(
+                Q(date__lt=day)
+                | Q(date=day, created_at__lt=created_at)
+                | Q(date=day, created_at=created_at, id__lt=pk)
+            )
+
+        # Fetch one extra row to learn whether another page exists
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page_rows = rows[:page_size]
+        return self.page_rows
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+
+        return Response({
+            'next': self.get_next_link(),
+            'next_cursor': self.next_cursor(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        cursor = self.next_cursor()
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        return None
+
+    def next_cursor(self):
+        if not self.has_next or not self.page_rows:
+            return None
+        last = self.page_rows[-1]
+        return self.encode_cursor(last.date, last.created_at, last.pk)
+
+    def encode_cursor(self, day, created_at, pk):
+        payload = json.dumps([day.isoformat(), created_at.isoformat(), pk])
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            day, created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            return date.fromisoformat(day), datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
@@ -1,23 +1,33 @@
-from .account import AccountSerializer, AccountCreateSerializer, AccountSummarySerializer
-from .category import CategorySerializer, CategoryTreeSerializer
-from .transaction import TransactionSerializer, TransactionCreateSerializer, TransactionSummarySerializer
-from .budget import BudgetSerializer, BudgetCreateSerializer, BudgetSummarySerializer
+from .account import (
+    AccountSerializer, AccountCreateSerializer, AccountBalanceAdjustmentSerializer, AccountSummarySerializer
+)
+from .category import CategorySerializer, CategoryTreeSerializer, CategorySpendingSerializer
+from .transaction import (
+    TransactionSerializer, TransactionCreateSerializer, TransactionBulkCreateSerializer, TransactionSummarySerializer
+)
+from .budget import BudgetSerializer, BudgetCreateSerializer, BudgetSummarySerializer, BudgetForecastSerializer
 from .goal import GoalSerializer, GoalCreateSerializer, GoalProgressUpdateSerializer, GoalSummarySerializer
+from .analytics import CashflowSerializer
 
 __all__ = [
     'AccountSerializer',
     'AccountCreateSerializer',
+    'AccountBalanceAdjustmentSerializer',
     'AccountSummarySerializer',
     'CategorySerializer',
     'CategoryTreeSerializer',
+    'CategorySpendingSerializer',
     'TransactionSerializer',
     'TransactionCreateSerializer',
+    'TransactionBulkCreateSerializer',
     'TransactionSummarySerializer',
     'BudgetSerializer',
     'BudgetCreateSerializer',
     'BudgetSummarySerializer',
+    'BudgetForecastSerializer',
     'GoalSerializer',
     'GoalCreateSerializer',
     'GoalProgressUpdateSerializer',
-    'GoalSummarySerializer'
+    'GoalSummarySerializer',
+    'CashflowSerializer'
 ]
\ No newline at end of file
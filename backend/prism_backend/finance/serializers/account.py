@@ -17,6 +17,14 @@ class AccountSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'owner', 'created_at', 'updated_at']
 
+    def get_fields(self):
+        """Make balance read-only on updates; corrections go through adjust_balance."""
+        fields = super().get_fields()
+        if self.instance is not None:
+            # A client's copy may predate later transactions and would overwrite them
+            fields['balance'].read_only = True
+        return fields
+
     def validate_name(self, value):
         """Validate account name is unique for the user."""
         request = self.context.get('request')
@@ -88,6 +96,21 @@ class AccountCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class AccountBalanceAdjustmentSerializer(serializers.Serializer):
+    """
+    Serializer for setting an account's balance to a reconciled figure.
+    """
+    balance = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+    def validate_balance(self, value):
+        """Validate balance is reasonable."""
+        if value < -999999999:
+            raise serializers.ValidationError("Balance cannot be less than -999,999,999")
+        if value > 999999999:
+            raise serializers.ValidationError("Balance cannot be more than 999,999,999")
+        return value
+
+
 class AccountSummarySerializer(serializers.Serializer):
     """
     Serializer for account summary statistics.
@@ -0,0 +1,31 @@
+from rest_framework import serializers
+
+
+class CashflowBucketSerializer(serializers.Serializer):
+    """
+    Serializer for one time bucket of the cash-flow series.
+    """
+    period = serializers.DateField()
+    income = serializers.DecimalField(max_digits=14, decimal_places=2)
+    expenses = serializers.DecimalField(max_digits=14, decimal_places=2)
+    net = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class CashflowBreakdownSerializer(serializers.Serializer):
+    """
+    Serializer for the cash-flow series of a single category or account.
+    """
+    id = serializers.IntegerField(allow_null=True)
+    name = serializers.CharField(allow_null=True)
+    buckets = CashflowBucketSerializer(many=True)
+
+
+class CashflowSerializer(serializers.Serializer):
+    """
+    Serializer for the bucketed cash-flow report.
+    """
+    interval = serializers.CharField()
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    buckets = CashflowBucketSerializer(many=True)
+    breakdown = CashflowBreakdownSerializer(many=True, required=False)
@@ -21,7 +21,7 @@ class BudgetSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'category', 'category_name', 'category_full_name',
             'amount', 'period', 'period_display', 'start_date', 'end_date',
-            'spent_amount', 'remaining_amount', 'percentage_used', 'is_over_budget',
+            'include_subcategories', 'spent_amount', 'remaining_amount', 'percentage_used', 'is_over_budget',
             'is_active', 'owner', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'owner', 'created_at', 'updated_at']
@@ -96,7 +96,7 @@ class BudgetCreateSerializer(serializers.ModelSerializer):
         model = Budget
         fields = [
             'name', 'category_id', 'amount', 'period',
-            'start_date', 'end_date', 'is_active'
+            'start_date', 'end_date', 'include_subcategories', 'is_active'
         ]
 
     def validate_category_id(self, value):
@@ -157,4 +157,23 @@ class BudgetSummarySerializer(serializers.Serializer):
     total_spent = serializers.DecimalField(max_digits=12, decimal_places=2)
     total_remaining = serializers.DecimalField(max_digits=12, decimal_places=2)
     over_budget_count = serializers.IntegerField()
-    on_track_count = serializers.IntegerField()
\ No newline at end of file
+    on_track_count = serializers.IntegerField()
+
+
+class BudgetForecastSerializer(serializers.Serializer):
+    """
+    Serializer for the burn-rate forecast of a single budget.
+    """
+    budget = serializers.IntegerField()
+    name = serializers.CharField()
+    amount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    days_elapsed = serializers.IntegerField()
+    days_remaining = serializers.IntegerField()
+    spent_to_date = serializers.DecimalField(max_digits=14, decimal_places=2)
+    daily_burn_rate = serializers.DecimalField(max_digits=14, decimal_places=2)
+    projected_spend = serializers.DecimalField(max_digits=14, decimal_places=2)
+    projected_remaining = serializers.DecimalField(max_digits=14, decimal_places=2)
+    projected_over_budget = serializers.BooleanField()
+    exhaustion_date = serializers.DateField(allow_null=True)
@@ -5,6 +5,8 @@ from ..models import Category
 class CategorySerializer(serializers.ModelSerializer):
     """
     Serializer for Category model with hierarchical support.
+    Pass a 'subcategory_index' (see services.category_tree) in the context
+    to render nested subcategories without a query per node.
     """
     category_type_display = serializers.CharField(source='get_category_type_display', read_only=True)
     full_name = serializers.CharField(read_only=True)
@@ -23,10 +25,12 @@ class CategorySerializer(serializers.ModelSerializer):
 
     def get_subcategories(self, obj):
         """Get subcategories for this category."""
-        if hasattr(obj, 'subcategories'):
+        index = self.context.get('subcategory_index')
+        if index is not None:
+            subcategories = index.get(obj.pk, [])
+        else:
             subcategories = obj.subcategories.filter(is_active=True)
-            return CategorySerializer(subcategories, many=True, context=self.context).data
-        return []
+        return CategorySerializer(subcategories, many=True, context=self.context).data
 
     def validate_name(self, value):
         """Validate category name is unique within the same parent for the user."""
@@ -61,14 +65,11 @@ class CategorySerializer(serializers.ModelSerializer):
                 if self.instance and value == self.instance:
                     raise serializers.ValidationError("Category cannot be its own parent.")
 
-                # Check for circular reference in hierarchy
-                current = value
-                while current.parent:
-                    if self.instance and current.parent == self.instance:
-                        raise serializers.ValidationError(
-                            "This would create a circular reference in the category hierarchy."
-                        )
-                    current = current.parent
+                # Check for circular reference in hierarchy using the materialized path
+                if self.instance and self.instance.is_ancestor_of(value):
+                    raise serializers.ValidationError(
+                        "This would create a circular reference in the category hierarchy."
+                    )
         return value
 
     def validate_color(self, value):
@@ -107,6 +108,21 @@ class CategoryTreeSerializer(serializers.ModelSerializer):
         ]
 
     def get_subcategories(self, obj):
-        """Recursively get subcategories."""
-        subcategories = obj.subcategories.filter(is_active=True)
-        return CategoryTreeSerializer(subcategories, many=True, context=self.context).data
\ No newline at end of file
+        """Recursively get subcategories, from the prefetched index when available."""
+        index = self.context.get('subcategory_index')
+        if index is not None:
+            subcategories = index.get(obj.pk, [])
+        else:
+            subcategories = obj.subcategories.filter(is_active=True)
+        return CategoryTreeSerializer(subcategories, many=True, context=self.context).data
+
+
+class CategorySpendingSerializer(serializers.Serializer):
+    """
+    Serializer for spending totals of a category including its subcategories.
+    """
+    category = serializers.IntegerField()
+    category_full_name = serializers.CharField()
+    total_income = serializers.DecimalField(max_digits=14, decimal_places=2)
+    total_expenses = serializers.DecimalField(max_digits=14, decimal_places=2)
+    total_transactions = serializers.IntegerField()
\ No newline at end of file
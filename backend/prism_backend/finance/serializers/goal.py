@@ -157,11 +157,10 @@ class GoalProgressUpdateSerializer(serializers.Serializer):
         return value
 
     def update_goal_progress(self, goal):
-        """Update the goal's progress."""
-        amount_change = self.validated_data['amount']
-        new_amount = goal.current_amount + amount_change
-        goal.update_progress(new_amount)
-        return goal
+        """Update the goal's progress with a single UPDATE."""
+        from ..services import goal_progress
+
+        return goal_progress.add_progress(goal, self.validated_data['amount'])
 
 
 class GoalSummarySerializer(serializers.Serializer):
@@ -22,9 +22,10 @@ class TransactionSerializer(serializers.ModelSerializer):
             'id', 'account', 'account_name', 'category', 'category_name',
             'category_full_name', 'amount', 'description', 'date', 'notes',
             'transfer_to', 'transfer_to_name', 'is_recurring', 'recurring_frequency',
+            'next_run_date', 'recurring_parent',
             'is_expense', 'is_income', 'is_transfer', 'owner', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'owner', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'next_run_date', 'recurring_parent', 'owner', 'created_at', 'updated_at']
 
     def validate_account(self, value):
         """Validate account belongs to the current user."""
@@ -95,6 +96,11 @@ class TransactionSerializer(serializers.ModelSerializer):
 class TransactionCreateSerializer(serializers.ModelSerializer):
     """
     Simplified serializer for transaction creation with ID-based relationships.
+
+    Accounts and categories are resolved once during validation and reused
+    by create(). Callers validating many rows can pass prefetched
+    ``accounts`` and ``categories`` dicts (id -> instance) in the context to
+    avoid per-row lookups.
     """
     account_id = serializers.IntegerField(write_only=True)
     category_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
@@ -107,43 +113,15 @@ class TransactionCreateSerializer(serializers.ModelSerializer):
             'notes', 'transfer_to_id', 'is_recurring', 'recurring_frequency'
         ]
 
-    def validate_account_id(self, value):
-        """Validate account exists and belongs to user."""
-        request = self.context.get('request')
-        if request and hasattr(request, 'user'):
-            try:
-                account = Account.objects.get(id=value, owner=request.user)
-                return value
-            except Account.DoesNotExist:
-                raise serializers.ValidationError("Account not found or does not belong to you.")
-        return value
-
-    def validate_category_id(self, value):
-        """Validate category exists and belongs to user if provided."""
-        if value:
-            request = self.context.get('request')
-            if request and hasattr(request, 'user'):
-                try:
-                    category = Category.objects.get(id=value, owner=request.user)
-                    return value
-                except Category.DoesNotExist:
-                    raise serializers.ValidationError("Category not found or does not belong to you.")
-        return value
-
-    def validate_transfer_to_id(self, value):
-        """Validate transfer account exists and belongs to user if provided."""
-        if value:
-            request = self.context.get('request')
-            if request and hasattr(request, 'user'):
-                try:
-                    account = Account.objects.get(id=value, owner=request.user)
-                    return value
-                except Account.DoesNotExist:
-                    raise serializers.ValidationError("Transfer account not found or does not belong to you.")
-        return value
+    def _get_owned(self, model, context_key, pk):
+        """Return the user's account/category with this id, or None."""
+        prefetched = self.context.get(context_key)
+        if prefetched is not None:
+            return prefetched.get(pk)
+        return model.objects.filter(id=pk, owner=self.context['request'].user).first()
 
     def validate(self, attrs):
-        """Validate transaction consistency."""
+        """Validate related objects belong to the user and the transaction is consistent."""
         # Prevent transfers to the same account
         if attrs.get('transfer_to_id') and attrs.get('account_id'):
             if attrs['transfer_to_id'] == attrs['account_id']:
@@ -155,39 +133,101 @@ class TransactionCreateSerializer(serializers.ModelSerializer):
                 "Transfer transactions should not have a category."
             )
 
+        request = self.context.get('request')
+        if request and hasattr(request, 'user'):
+            errors = {}
+
+            attrs['account'] = self._get_owned(Account, 'accounts', attrs.pop('account_id'))
+            if attrs['account'] is None:
+                errors['account_id'] = "Account not found or does not belong to you."
+
+            category_id = attrs.pop('category_id', None)
+            attrs['category'] = None
+            if category_id:
+                attrs['category'] = self._get_owned(Category, 'categories', category_id)
+                if attrs['category'] is None:
+                    errors['category_id'] = "Category not found or does not belong to you."
+
+            transfer_to_id = attrs.pop('transfer_to_id', None)
+            attrs['transfer_to'] = None
+            if transfer_to_id:
+                attrs['transfer_to'] = self._get_owned(Account, 'accounts', transfer_to_id)
+                if attrs['transfer_to'] is None:
+                    errors['transfer_to_id'] = "Transfer account not found or does not belong to you."
+
+            if errors:
+                raise serializers.ValidationError(errors)
+
         return attrs
 
     def create(self, validated_data):
-        """Create transaction with proper model relationships."""
+        """Create transaction with the related objects resolved during validation."""
         request = self.context.get('request')
         user = request.user
 
-        # Convert IDs to model instances
-        account_id = validated_data.pop('account_id')
-        account = Account.objects.get(id=account_id, owner=user)
-
-        category_id = validated_data.pop('category_id', None)
-        category = None
-        if category_id:
-            category = Category.objects.get(id=category_id, owner=user)
-
-        transfer_to_id = validated_data.pop('transfer_to_id', None)
-        transfer_to = None
-        if transfer_to_id:
-            transfer_to = Account.objects.get(id=transfer_to_id, owner=user)
-
-        # Create transaction
         transaction = Transaction.objects.create(
             owner=user,
-            account=account,
-            category=category,
-            transfer_to=transfer_to,
             **validated_data
         )
 
         return transaction
 
 
+class TransactionBulkCreateSerializer(serializers.ListSerializer):
+    """
+    List serializer for bulk transaction creation.
+    Rows are validated in memory and inserted with bulk_create in chunks
+    inside a single database transaction.
+    """
+    child = TransactionCreateSerializer()
+
+    def create(self, validated_data):
+        """Insert all rows and update rollups and balances once per batch."""
+        from django.conf import settings
+        from django.db import transaction as db_transaction
+        from ..services import ledger, recurring, response_cache, rollup, sync
+
+        user = self.context['request'].user
+        batch_size = self.context.get('batch_size') or settings.TRANSACTION_BULK_BATCH_SIZE
+
+        transactions = [Transaction(owner=user, **attrs) for attrs in validated_data]
+        # bulk_create skips Transaction.save(), so do its per-row work here
+        for transaction in transactions:
+            transaction.import_hash = transaction.compute_import_hash()
+            recurring.schedule(None, transaction)
+
+        with db_transaction.atomic():
+            for start in range(0, len(transactions), batch_size):
+                batch = transactions[start:start + batch_size]
+                Transaction.objects.bulk_create(batch)
+                rollup.record_transactions(batch)
+                ledger.record_transactions(batch)
+            sync.touch_on_commit(Transaction, [transaction.pk for transaction in transactions])
+
+        # bulk_create skips model signals, so invalidate cached summaries here
+        response_cache.bump(user.pk)
+        return transactions
+
+
+class TransactionSummaryGroupSerializer(serializers.Serializer):
+    """
+    Serializer for one group-by row of the transaction summary.
+    Only the requested dimensions are present.
+    """
+    category = serializers.IntegerField(required=False)
+    category_name = serializers.CharField(required=False)
+    account = serializers.IntegerField(required=False)
+    account_name = serializers.CharField(required=False)
+    month = serializers.DateField(required=False)
+    total_transactions = serializers.IntegerField()
+    total_income = serializers.DecimalField(max_digits=14, decimal_places=2)
+    total_expenses = serializers.DecimalField(max_digits=14, decimal_places=2)
+    net_income = serializers.DecimalField(max_digits=14, decimal_places=2)
+    income_transactions = serializers.IntegerField()
+    expense_transactions = serializers.IntegerField()
+    transfer_transactions = serializers.IntegerField()
+
+
 class TransactionSummarySerializer(serializers.Serializer):
     """
     Serializer for transaction summary statistics.
@@ -198,4 +238,5 @@ class TransactionSummarySerializer(serializers.Serializer):
     net_income = serializers.DecimalField(max_digits=12, decimal_places=2)
     income_transactions = serializers.IntegerField()
     expense_transactions = serializers.IntegerField()
-    transfer_transactions = serializers.IntegerField()
\ No newline at end of file
+    transfer_transactions = serializers.IntegerField()
+    groups = TransactionSummaryGroupSerializer(many=True, required=False)
\ No newline at end of file
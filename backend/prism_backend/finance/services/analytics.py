@@ -0,0 +1,215 @@
+"""
+Set-based reporting over transactions.
+
+Every statistic is computed in one aggregate pass with conditional
+Sum/Count expressions; optional group-by dimensions come out of the same
+grouped query and totals are derived from the grouped rows. Time series
+are bucketed in the database with Trunc and gap-filled in Python.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+
+ZERO = Decimal('0.00')
+
+SUMMARY_AGGREGATES = {
+    'total_transactions': Count('id'),
+    'income_sum': Sum('amount', filter=Q(amount__gt=0)),
+    'expense_sum': Sum('amount', filter=Q(amount__lt=0)),
+    'income_transactions': Count('id', filter=Q(amount__gt=0)),
+    'expense_transactions': Count('id', filter=Q(amount__lt=0)),
+    'transfer_transactions': Count('id', filter=Q(transfer_to__isnull=False)),
+}
+
+COUNT_FIELDS = ('total_transactions', 'income_transactions', 'expense_transactions', 'transfer_transactions')
+
+# Group-by dimension -> {output name: field lookup or expression}
+SUMMARY_DIMENSIONS = {
+    'category': {'category': 'category', 'category_name': 'category__name'},
+    'account': {'account': 'account', 'account_name': 'account__name'},
+    'month': {'month': TruncMonth('date')},
+}
+
+
+def parse_dimensions(value, allowed=SUMMARY_DIMENSIONS):
+    """Split a comma separated group_by parameter, rejecting unknown names."""
+    if not value:
+        return []
+    dimensions = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in dimensions if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown group_by dimension(s): {', '.join(unknown)}")
+    return list(dict.fromkeys(dimensions))
+
+
+def _summary_stats(row):
+    income = row['income_sum'] or ZERO
+    expenses = abs(row['expense_sum'] or ZERO)
+    stats = {field: row[field] or 0 for field in COUNT_FIELDS}
+    stats.update({
+        'total_income': income,
+        'total_expenses': expenses,
+        'net_income': income - expenses,
+    })
+    return stats
+
+
+def transaction_summary(queryset, group_by=()):
+    """
+    Summarise a transaction queryset in a single query.
+
+    Without dimensions this is one aggregate; with dimensions it is one
+    grouped query whose rows are returned under 'groups' and summed for the
+    overall totals.
+    """
+    queryset = queryset.order_by()
+
+    if not group_by:
+        return _summary_stats(queryset.aggregate(**SUMMARY_AGGREGATES))
+
+    fields, expressions, names = [], {}, {}
+    for dimension in group_by:
+        for name, source in SUMMARY_DIMENSIONS[dimension].items():
+            if isinstance(source, str):
+                fields.append(source)
+                names[name] = source
+            else:
+                expressions[name] = source
+                names[name] = name
+
+    rows = list(
+        queryset.values(*fields, **expressions)
+        .annotate(**SUMMARY_AGGREGATES)
+        .order_by(*names.values())
+    )
+
+    totals = {field: 0 for field in COUNT_FIELDS}
+    totals.update({'income_sum': ZERO, 'expense_sum': ZERO})
+    groups = []
+    for row in rows:
+        for field in totals:
+            totals[field] += row[field] or 0
+        group = {name: row[source] for name, source in names.items()}
+        group.update(_summary_stats(row))
+        groups.append(group)
+
+    summary = _summary_stats(totals)
+    summary['groups'] = groups
+    return summary
+
+
+CASHFLOW_INTERVALS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+# Default window when no start_date is given, in buckets
+CASHFLOW_DEFAULT_BUCKETS = {'day': 30, 'week': 12, 'month': 12}
+
+CASHFLOW_MAX_BUCKETS = 1000
+
+CASHFLOW_BREAKDOWNS = {
+    'category': ('category', 'category__name'),
+    'account': ('account', 'account__name'),
+}
+
+
+def bucket_start(day, interval):
+    """Return the first day of the bucket containing day."""
+    if interval == 'month':
+        return day.replace(day=1)
+    if interval == 'week':
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def next_bucket(day, interval):
+    if interval == 'month':
+        return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+    if interval == 'week':
+        return day + timedelta(days=7)
+    return day + timedelta(days=1)
+
+
+def cashflow_window(interval, start_date=None, end_date=None):
+    """Resolve the requested window, defaulting to the most recent buckets."""
+    end_date = end_date or date.today()
+    if start_date is None:
+        start_date = bucket_start(end_date, interval)
+        for _ in range(CASHFLOW_DEFAULT_BUCKETS[interval] - 1):
+            start_date = bucket_start(start_date - timedelta(days=1), interval)
+    return start_date, end_date
+
+
+def bucket_range(start_date, end_date, interval):
+    """Every bucket start between the two dates, used to fill gaps."""
+    buckets = []
+    current = bucket_start(start_date, interval)
+    while current <= end_date:
+        buckets.append(current)
+        if len(buckets) > CASHFLOW_MAX_BUCKETS:
+            raise ValueError(f'Date range spans more than {CASHFLOW_MAX_BUCKETS} buckets')
+        current = next_bucket(current, interval)
+    return buckets
+
+
+def _bucket(period, income, expenses):
+    return {'period': period, 'income': income, 'expenses': expenses, 'net': income - expenses}
+
+
+def cashflow(queryset, interval, start_date, end_date, breakdown=None):
+    """
+    Income, expenses and net per time bucket for a transaction queryset,
+    grouped in a single query and gap-filled with empty buckets.
+    """
+    buckets = bucket_range(start_date, end_date, interval)
+
+    fields = list(CASHFLOW_BREAKDOWNS[breakdown]) if breakdown else []
+    rows = (
+        queryset.filter(date__gte=start_date, date__lte=end_date)
+        .order_by()
+        .annotate(period=CASHFLOW_INTERVALS[interval]('date'))
+        .values('period', *fields)
+        .annotate(
+            income=Sum('amount', filter=Q(amount__gt=0)),
+            expenses=Sum('amount', filter=Q(amount__lt=0)),
+        )
+    )
+
+    totals = defaultdict(lambda: [ZERO, ZERO])
+    groups = defaultdict(lambda: defaultdict(lambda: [ZERO, ZERO]))
+    names = {}
+    for row in rows:
+        period = row['period']
+        if hasattr(period, 'date'):
+            period = period.date()
+        income, expenses = Decimal(row['income'] or 0), abs(Decimal(row['expenses'] or 0))
+        totals[period][0] += income
+        totals[period][1] += expenses
+        if breakdown:
+            key = row[fields[0]]
+            names[key] = row[fields[1]]
+            groups[key][period][0] += income
+            groups[key][period][1] += expenses
+
+    result = {
+        'interval': interval,
+        'start_date': start_date,
+        'end_date': end_date,
+        'buckets': [_bucket(period, *totals.get(period, (ZERO, ZERO))) for period in buckets],
+    }
+
+    if breakdown:
+        result['breakdown'] = [
+            {
+                'id': key,
+                'name': names[key],
+                'buckets': [_bucket(period, *series.get(period, (ZERO, ZERO))) for period in buckets],
+            }
+            for key, series in sorted(groups.items(), key=lambda item: (names[item[0]] or '', item[0] or 0))
+        ]
+
+    return result
\ No newline at end of file
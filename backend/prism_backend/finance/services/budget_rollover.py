@@ -0,0 +1,135 @@
+"""
+Budget period rollover.
+
+Every active budget whose window has ended gets a successor covering the
+next window of the same length in months. Due budgets are claimed in
+batches with ``select_for_update(skip_locked=True)``; each batch is checked
+for overlaps with one query and the successors are bulk-inserted. A budget
+is marked ``rolled_over`` whether or not a successor was needed, so it is
+never looked at again. Successors that have also ended are picked up by a
+later batch of the same job, so long gaps catch up in one run.
+"""
+from datetime import date, timedelta
+from django.db import transaction as db_transaction
+from . import response_cache, sync
+from .recurring import add_months
+
+PERIOD_MONTHS = {
+    'monthly': 1,
+    'quarterly': 3,
+    'yearly': 12,
+}
+
+SUCCESSOR_FIELDS = ('owner_id', 'category_id', 'name', 'amount', 'period', 'include_subcategories')
+
+
+def next_window(budget):
+    """(start, end) of the period following budget's window."""
+    start = budget.end_date + timedelta(days=1)
+    end = add_months(start, PERIOD_MONTHS[budget.period]) - timedelta(days=1)
+    return start, end
+
+
+def successor(budget):
+    from ..models import Budget
+
+    start, end = next_window(budget)
+    return Budget(
+        start_date=start,
+        end_date=end,
+        is_active=True,
+        **{field: getattr(budget, field) for field in SUCCESSOR_FIELDS}
+    )
+
+
+def existing_windows(candidates):
+    """
+    Map (owner_id, category_id) to the windows of budgets that could overlap
+    any of the candidates, loaded with a single query for the batch. Each
+    window is (start, end, is_active).
+    """
+    from ..models import Budget
+
+    windows = {}
+    if not candidates:
+        return windows
+
+    rows = Budget.objects.filter(
+        owner_id__in={c.owner_id for c in candidates},
+        category_id__in={c.category_id for c in candidates},
+        start_date__lte=max(c.end_date for c in candidates),
+        end_date__gte=min(c.start_date for c in candidates),
+    ).values_list('owner_id', 'category_id', 'start_date', 'end_date', 'is_active')
+    for owner_id, category_id, start, end, is_active in rows:
+        windows.setdefault((owner_id, category_id), []).append((start, end, is_active))
+    return windows
+
+
+def is_taken(candidate, windows):
+    """
+    Whether an active budget overlaps the candidate's window, or an inactive
+    one has exactly that window (unique_together counts inactive budgets too).
+    """
+    for start, end, is_active in windows:
+        if is_active and start <= candidate.end_date and end >= candidate.start_date:
+            return True
+        if (start, end) == (candidate.start_date, candidate.end_date):
+            return True
+    return False
+
+
+def run_batch(budgets, today, batch_size=500):
+    """
+    Roll over up to batch_size ended budgets from the budgets queryset.
+    Returns (budgets processed, successors created) as lists.
+    """
+    from ..models import Budget
+
+    with db_transaction.atomic():
+        due = list(
+            budgets.select_for_update(skip_locked=True)
+            .filter(is_active=True, rolled_over=False, end_date__lt=today)
+            .order_by('end_date', 'pk')[:batch_size]
+        )
+        if not due:
+            return [], []
+
+        candidates = [successor(budget) for budget in due]
+        windows = existing_windows(candidates)
+
+        created = []
+        for candidate in candidates:
+            taken = windows.setdefault((candidate.owner_id, candidate.category_id), [])
+            if is_taken(candidate, taken):
+                continue
+            # Later candidates in the batch must not overlap this one either
+            taken.append((candidate.start_date, candidate.end_date, True))
+            created.append(candidate)
+
+        Budget.objects.bulk_create(created, batch_size=batch_size)
+        for budget in due:
+            budget.rolled_over = True
+        Budget.objects.bulk_update(due, ['rolled_over'], batch_size=batch_size)
+        # bulk_update skips auto_now, so restamp both sides for sync clients
+        sync.touch_on_commit(Budget, [budget.pk for budget in due + created])
+
+    for owner_id in {budget.owner_id for budget in due}:
+        response_cache.bump(owner_id)
+    return due, created
+
+
+def rollover(budgets=None, today=None, batch_size=500):
+    """
+    Create successors for every ended budget in budgets (default: all users).
+    Returns the list of created budgets.
+    """
+    from ..models import Budget
+
+    budgets = Budget.objects.all() if budgets is None else budgets
+    today = today or date.today()
+    created = []
+    while True:
+        due, batch = run_batch(budgets, today, batch_size)
+        if not due:
+            return created
+        created.extend(batch)
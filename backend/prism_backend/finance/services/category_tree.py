@@ -0,0 +1,36 @@
+"""
+In-memory category hierarchy built from a single query. The rendered tree
+is cached with the other per-user responses (see response_cache), so it is
+shared by all workers and invalidated when a category write commits.
+"""
+from collections import defaultdict
+from . import response_cache
+
+
+def subcategory_index(owner):
+    """
+    Return {parent_id: [active children in name order]} for all of the
+    owner's active categories, loaded with one query. Roots live under None.
+    """
+    from ..models import Category
+
+    index = defaultdict(list)
+    for category in Category.objects.filter(owner=owner, is_active=True).select_related('owner', 'parent'):
+        index[category.parent_id].append(category)
+    return index
+
+
+def get_tree(owner, context):
+    """Return the serialized active category tree for owner, cached per user."""
+    from ..serializers import CategoryTreeSerializer
+
+    def build_tree():
+        index = subcategory_index(owner)
+        serializer = CategoryTreeSerializer(
+            index.get(None, []),
+            many=True,
+            context={**context, 'subcategory_index': index}
+        )
+        return serializer.data
+
+    return response_cache.get_or_compute(owner.pk, 'category_tree', build_tree)
@@ -0,0 +1,59 @@
+"""
+Streaming serialisation of transaction querysets to CSV and NDJSON.
+
+Rows are read with a server-side cursor (``QuerySet.iterator``) and
+encoded one at a time, so memory use does not depend on history size.
+"""
+import csv
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_FIELDS = [
+    ('id', 'id'),
+    ('date', 'date'),
+    ('description', 'description'),
+    ('amount', 'amount'),
+    ('account', 'account__name'),
+    ('category', 'category__name'),
+    ('transfer_to', 'transfer_to__name'),
+    ('notes', 'notes'),
+    ('is_recurring', 'is_recurring'),
+    ('recurring_frequency', 'recurring_frequency'),
+    ('created_at', 'created_at'),
+]
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class _Echo:
+    """File-like object whose write() hands the encoded line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def _rows(queryset, chunk_size):
+    columns = [column for _, column in EXPORT_FIELDS]
+    return queryset.values_list(*columns).iterator(chunk_size=chunk_size)
+
+
+def stream_csv(queryset, chunk_size=2000):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([name for name, _ in EXPORT_FIELDS])
+    for row in _rows(queryset, chunk_size):
+        yield writer.writerow(row)
+
+
+def stream_ndjson(queryset, chunk_size=2000):
+    names = [name for name, _ in EXPORT_FIELDS]
+    for row in _rows(queryset, chunk_size):
+        yield json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+def stream(queryset, export_format, chunk_size=2000):
+    if export_format == 'ndjson':
+        return stream_ndjson(queryset, chunk_size)
+    return stream_csv(queryset, chunk_size)
@@ -0,0 +1,119 @@
+"""
+Burn-rate forecasts for budgets.
+
+The daily spending series of every category involved is loaded from the
+rollups in one query and laid out as a (category x day) matrix. A
+(budget x category) membership matrix maps it to per-budget daily spend,
+and every statistic is then computed for all budgets at once with array
+operations: spend to date, average daily burn, projected end-of-period
+spend and the day the budget runs out.
+"""
+from datetime import date
+import numpy as np
+from django.db.models import Sum
+
+
+def _ordinals(values):
+    return np.fromiter((value.toordinal() for value in values), dtype=np.int64, count=len(values))
+
+
+def daily_matrix(owner, first_day, last_day):
+    """
+    Return (category_ids, category_paths, spend) where spend[c, d] is the
+    expense total of category c on first_day + d.
+    """
+    from ..models import DailyRollup
+
+    rows = list(
+        DailyRollup.objects.filter(
+            owner=owner,
+            category__isnull=False,
+            day__gte=first_day,
+            day__lte=last_day,
+        )
+        .values_list('category_id', 'category__path', 'day')
+        .annotate(total=Sum('expense_total'))
+        .order_by()
+    )
+    days = (last_day - first_day).days + 1
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=str), np.zeros((0, days))
+
+    category_column, paths, day_column, totals = zip(*rows)
+    category_ids, columns = np.unique(np.array(category_column, dtype=np.int64), return_inverse=True)
+    category_paths = np.empty(len(category_ids), dtype=object)
+    category_paths[columns] = paths
+
+    spend = np.zeros((len(category_ids), days))
+    np.add.at(spend, (columns, _ordinals(day_column) - first_day.toordinal()), np.array(totals, dtype=float))
+    return category_ids, category_paths.astype(str), spend
+
+
+def forecast(budgets, owner, today=None):
+    """
+    Forecast each budget in the list. Returns one dict per budget with
+    spend so far, burn rate, projected spend and exhaustion date.
+    """
+    today = today or date.today()
+    if not budgets:
+        return []
+
+    amount = np.array([float(budget.amount) for budget in budgets])
+    start = _ordinals([budget.start_date for budget in budgets])
+    end = _ordinals([budget.end_date for budget in budgets])
+    budget_categories = np.array([budget.category_id for budget in budgets], dtype=np.int64)
+    budget_paths = np.array([budget.category.path for budget in budgets], dtype=str)
+    include_subcategories = np.array([budget.include_subcategories for budget in budgets], dtype=bool)
+
+    origin = int(start.min())
+    first_day = date.fromordinal(origin)
+    last_day = date.fromordinal(int(max(min(end.max(), today.toordinal()), origin)))
+    category_ids, category_paths, spend = daily_matrix(owner, first_day, last_day)
+
+    # membership[b, c]: category c counts towards budget b
+    membership = budget_categories[:, None] == category_ids[None, :]
+    if include_subcategories.any() and len(category_ids):
+        below = np.char.startswith(category_paths[None, :], budget_paths[:, None])
+        membership |= include_subcategories[:, None] & below
+    budget_spend = membership.astype(float) @ spend
+
+    # Restrict each budget's series to its own window, up to today
+    day = origin + np.arange(budget_spend.shape[1])
+    in_window = (day[None, :] >= start[:, None]) & (day[None, :] <= np.minimum(end, today.toordinal())[:, None])
+    cumulative = np.cumsum(budget_spend * in_window, axis=1)
+    spent = cumulative[:, -1]
+
+    total_days = end - start + 1
+    elapsed = np.clip(today.toordinal() - start + 1, 0, total_days)
+    remaining_days = total_days - elapsed
+    burn_rate = np.divide(spent, elapsed, out=np.zeros_like(spent), where=elapsed > 0)
+    projected = spent + burn_rate * remaining_days
+
+    # Exhaustion: the day cumulative spend reached the amount, or the day the
+    # current burn rate is expected to reach it within the period
+    crossed = cumulative >= amount[:, None]
+    already = crossed.any(axis=1) & (amount > 0)
+    crossed_day = origin + crossed.argmax(axis=1)
+    days_left = np.ceil(np.divide(amount - spent, burn_rate, out=np.full_like(spent, np.inf), where=burn_rate > 0))
+    expected_day = today.toordinal() + np.where(np.isfinite(days_left), days_left, 0).astype(np.int64)
+    expected = ~already & np.isfinite(days_left) & (expected_day <= end)
+    exhaustion = np.where(already, crossed_day, np.where(expected, expected_day, 0))
+
+    return [
+        {
+            'budget': budget.pk,
+            'name': budget.name,
+            'amount': budget.amount,
+            'start_date': budget.start_date,
+            'end_date': budget.end_date,
+            'days_elapsed': int(elapsed[i]),
+            'days_remaining': int(remaining_days[i]),
+            'spent_to_date': round(float(spent[i]), 2),
+            'daily_burn_rate': round(float(burn_rate[i]), 2),
+            'projected_spend': round(float(projected[i]), 2),
+            'projected_remaining': round(float(amount[i] - projected[i]), 2),
+            'projected_over_budget': bool(projected[i] > amount[i]),
+            'exhaustion_date': date.fromordinal(int(exhaustion[i])) if exhaustion[i] else None,
+        }
+        for i, budget in enumerate(budgets)
+    ]
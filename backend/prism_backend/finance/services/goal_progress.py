@@ -0,0 +1,61 @@
+"""
+Incremental goal progress.
+
+Goals linked to an account move with that account's activity: the same
+per-account deltas the ledger posts are applied to every active goal
+linked to those accounts in one UPDATE. Completion is decided in that
+statement too, from the new amount, so concurrent writers never race a
+read-modify-write of current_amount. Progress never goes below zero, so
+withdrawals past what was saved leave the goal at nothing saved.
+"""
+from django.db.models import BooleanField, Case, DateTimeField, DecimalField, F, Q, Value, When
+from django.db.models.functions import Greatest, Now
+from . import response_cache
+
+AMOUNT_FIELD = DecimalField(max_digits=12, decimal_places=2)
+
+
+def _progress_update(delta):
+    """UPDATE assignments adding delta (an expression) to current_amount."""
+    new_amount = Greatest(F('current_amount') + delta, Value(0), output_field=AMOUNT_FIELD)
+    reached = Q(target_amount__lte=new_amount)
+    return {
+        'current_amount': new_amount,
+        'is_completed': Case(When(reached, then=Value(True)), default=Value(False), output_field=BooleanField()),
+        'completed_at': Case(
+            When(reached & Q(completed_at__isnull=False), then=F('completed_at')),
+            When(reached, then=Now()),
+            default=Value(None),
+            output_field=DateTimeField(),
+        ),
+        'updated_at': Now(),
+    }
+
+
+def apply_deltas(deltas):
+    """Add {account_id: delta} to all active goals linked to those accounts."""
+    from ..models import Goal
+
+    deltas = {account_id: delta for account_id, delta in deltas.items() if delta}
+    if not deltas:
+        return 0
+
+    delta = Case(
+        *[When(linked_account_id=account_id, then=Value(amount)) for account_id, amount in deltas.items()],
+        default=Value(0),
+        output_field=AMOUNT_FIELD,
+    )
+    return Goal.objects.filter(linked_account_id__in=deltas, is_active=True).update(**_progress_update(delta))
+
+
+def add_progress(goal, amount):
+    """Add amount to a single goal with one UPDATE and reload its progress fields."""
+    from ..models import Goal
+    from ..models.goal import PROGRESS_ANNOTATIONS
+
+    Goal.objects.filter(pk=goal.pk).update(**_progress_update(Value(amount, output_field=AMOUNT_FIELD)))
+    goal.refresh_from_db(fields=['current_amount', 'is_completed', 'completed_at', 'updated_at'])
+    for attr in PROGRESS_ANNOTATIONS:
+        goal.__dict__.pop(attr, None)
+    response_cache.bump(goal.owner_id)
+    return goal
@@ -0,0 +1,136 @@
+"""
+Double-entry maintenance of Account.balance.
+
+A transaction moves ``amount`` into its account; a transfer additionally
+moves ``-amount`` into ``transfer_to``, so every transfer nets to zero.
+The same deltas move the progress of goals linked to those accounts.
+Balances are only ever changed with F() increments on rows locked in
+primary-key order, which keeps concurrent workers from losing updates or
+deadlocking against each other.
+"""
+from collections import defaultdict
+from decimal import Decimal
+from django.db import transaction as db_transaction
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from . import goal_progress, response_cache
+
+ZERO = Decimal('0.00')
+CENT = Decimal('0.01')
+
+LEDGER_FIELDS = ('account_id', 'transfer_to_id', 'amount')
+
+
+def _values(txn):
+    """Return the ledger-relevant values of a transaction instance or dict."""
+    if isinstance(txn, dict):
+        return tuple(txn[field] for field in LEDGER_FIELDS)
+    return tuple(getattr(txn, field) for field in LEDGER_FIELDS)
+
+
+def _add(deltas, values, sign):
+    account_id, transfer_to_id, amount = values
+    deltas[account_id] += sign * amount
+    if transfer_to_id:
+        deltas[transfer_to_id] -= sign * amount
+
+
+def apply_deltas(deltas):
+    """Apply {account_id: delta} to account balances in a single UPDATE."""
+    from ..models import Account
+
+    deltas = {account_id: delta for account_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    account_ids = sorted(deltas)
+    with db_transaction.atomic():
+        # Lock in a stable order so concurrent transfers cannot deadlock
+        list(
+            Account.objects.select_for_update()
+            .filter(pk__in=account_ids)
+            .order_by('pk')
+            .values_list('pk', flat=True)
+        )
+
+        balance_field = DecimalField(max_digits=12, decimal_places=2)
+        Account.objects.filter(pk__in=account_ids).update(
+            balance=F('balance') + Case(
+                *[When(pk=account_id, then=Value(deltas[account_id])) for account_id in account_ids],
+                default=Value(ZERO),
+                output_field=balance_field,
+            ),
+            updated_at=timezone.now()
+        )
+
+
+def record_transactions(transactions, sign=1):
+    """Post (sign=1) or reverse (sign=-1) a batch of transactions."""
+    deltas = defaultdict(lambda: ZERO)
+    for txn in transactions:
+        _add(deltas, _values(txn), sign)
+    apply_deltas(deltas)
+    goal_progress.apply_deltas(deltas)
+
+
+def record_change(previous, current):
+    """
+    Reverse a transaction's previous values (a dict, or None for a new row)
+    and post its current values.
+    """
+    deltas = defaultdict(lambda: ZERO)
+    if previous is not None:
+        _add(deltas, _values(previous), -1)
+    _add(deltas, _values(current), 1)
+    apply_deltas(deltas)
+    goal_progress.apply_deltas(deltas)
+
+
+def with_ledger_balance(queryset):
+    """Annotate accounts with the balance implied by their transaction history."""
+    from ..models import Transaction
+
+    balance_field = DecimalField(max_digits=12, decimal_places=2)
+
+    posted = Transaction.objects.filter(
+        account=OuterRef('pk')
+    ).order_by().values('account').annotate(total=Sum('amount')).values('total')
+    transferred_in = Transaction.objects.filter(
+        transfer_to=OuterRef('pk')
+    ).order_by().values('transfer_to').annotate(total=Sum('amount')).values('total')
+
+    return queryset.annotate(
+        ledger_balance=(
+            F('opening_balance')
+            + Coalesce(Subquery(posted, output_field=balance_field), Value(ZERO))
+            - Coalesce(Subquery(transferred_in, output_field=balance_field), Value(ZERO))
+        )
+    )
+
+
+def reconcile(queryset, dry_run=False, batch_size=500):
+    """
+    Recompute balances from the ledger for every account in the queryset.
+    Returns a list of (account, stored_balance, ledger_balance) for accounts
+    that had drifted; they are corrected unless dry_run is set.
+
+    Corrections are applied as increments so writes that land while the
+    scan is running are not overwritten.
+    """
+    drifted = []
+    for account in with_ledger_balance(queryset).order_by('pk').iterator(chunk_size=batch_size):
+        ledger_balance = Decimal(account.ledger_balance).quantize(CENT)
+        if account.balance != ledger_balance:
+            drifted.append((account, account.balance, ledger_balance))
+
+    if not dry_run:
+        for start in range(0, len(drifted), batch_size):
+            apply_deltas({
+                account.pk: ledger_balance - balance
+                for account, balance, ledger_balance in drifted[start:start + batch_size]
+            })
+        for owner_id in {account.owner_id for account, _, _ in drifted}:
+            response_cache.bump(owner_id)
+
+    return drifted
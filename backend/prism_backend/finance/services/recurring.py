@@ -0,0 +1,147 @@
+"""
+Materialization of recurring transactions.
+
+A transaction with ``is_recurring`` set is a template: it is itself the
+first occurrence and ``next_run_date`` holds the date of the next one.
+The scheduler claims due templates with ``select_for_update(skip_locked=True)``
+so several workers can run side by side, bulk-creates every occurrence up
+to today and advances ``next_run_date`` in the same database transaction.
+A unique (recurring_parent, date) constraint backs this up, so re-running
+after a crash never creates duplicates.
+"""
+import calendar
+from datetime import date, timedelta
+from django.db import transaction as db_transaction
+from . import ledger, response_cache, rollup, sync
+
+SCHEDULE_FIELDS = ('date', 'is_recurring', 'recurring_frequency', 'next_run_date')
+
+# Occurrences created per template per pass, so a long-neglected daily
+# template cannot build one huge batch
+MAX_CATCH_UP = 366
+
+OCCURRENCE_FIELDS = ('owner_id', 'account_id', 'category_id', 'transfer_to_id', 'amount', 'description', 'notes')
+
+
+def add_months(day, months, anchor_day=None):
+    """Shift day by whole months, keeping anchor_day (default day.day) where the month allows."""
+    anchor_day = anchor_day or day.day
+    month = day.month - 1 + months
+    year, month = day.year + month // 12, month % 12 + 1
+    return date(year, month, min(anchor_day, calendar.monthrange(year, month)[1]))
+
+
+def next_occurrence(day, frequency, anchor=None):
+    """
+    The occurrence after ``day`` in a schedule starting at ``anchor``
+    (default ``day``). Monthly and yearly occurrences are counted from the
+    anchor rather than stepped from ``day``, so a schedule on the 31st
+    returns to the 31st after a short month instead of drifting.
+    """
+    anchor = anchor or day
+    if frequency == 'daily':
+        return day + timedelta(days=1)
+    if frequency == 'weekly':
+        return day + timedelta(weeks=1)
+    if frequency in ('monthly', 'yearly'):
+        step = 1 if frequency == 'monthly' else 12
+        elapsed = (day.year - anchor.year) * 12 + day.month - anchor.month
+        return add_months(anchor, (elapsed // step + 1) * step)
+    raise ValueError(f"Unknown recurring frequency '{frequency}'")
+
+
+def schedule(previous, txn):
+    """
+    Set ``txn.next_run_date`` before a save. The schedule restarts from the
+    template's date when it is first made recurring or its date or frequency
+    changes; otherwise the stored value is kept so stale instances cannot
+    rewind it.
+    """
+    if not (txn.is_recurring and txn.recurring_frequency):
+        txn.next_run_date = None
+        return
+
+    unchanged = previous and all(
+        previous[field] == getattr(txn, field) for field in ('date', 'is_recurring', 'recurring_frequency')
+    )
+    if unchanged and previous['next_run_date']:
+        txn.next_run_date = previous['next_run_date']
+    else:
+        txn.next_run_date = next_occurrence(txn.date, txn.recurring_frequency)
+
+
+def occurrences(template, today):
+    """Build the unsaved occurrences of template due on or before today."""
+    from ..models import Transaction
+
+    built = []
+    day = template.next_run_date
+    while day <= today and len(built) < MAX_CATCH_UP:
+        occurrence = Transaction(
+            recurring_parent_id=template.pk,
+            date=day,
+            **{field: getattr(template, field) for field in OCCURRENCE_FIELDS}
+        )
+        occurrence.import_hash = occurrence.compute_import_hash()
+        built.append(occurrence)
+        day = next_occurrence(day, template.recurring_frequency, template.date)
+    template.next_run_date = day
+    return built
+
+
+def run_batch(today, batch_size=500):
+    """
+    Claim up to batch_size due templates and materialize them in one
+    transaction. Returns (templates processed, occurrences created).
+    """
+    from ..models import Transaction
+
+    with db_transaction.atomic():
+        templates = list(
+            Transaction.objects.select_for_update(skip_locked=True)
+            .filter(is_recurring=True, next_run_date__lte=today)
+            .order_by('next_run_date', 'pk')[:batch_size]
+        )
+        if not templates:
+            return 0, 0
+
+        candidates = [occurrence for template in templates for occurrence in occurrences(template, today)]
+
+        # Skip anything an earlier, interrupted run already wrote
+        existing = set(
+            Transaction.objects.filter(
+                recurring_parent__in=templates,
+                date__in={occurrence.date for occurrence in candidates}
+            ).values_list('recurring_parent_id', 'date')
+        )
+        created = [
+            occurrence for occurrence in candidates
+            if (occurrence.recurring_parent_id, occurrence.date) not in existing
+        ]
+
+        Transaction.objects.bulk_create(created, batch_size=batch_size)
+        rollup.record_transactions(created)
+        ledger.record_transactions(created)
+        sync.touch_on_commit(Transaction, [occurrence.pk for occurrence in created])
+        Transaction.objects.bulk_update(templates, ['next_run_date'], batch_size=batch_size)
+
+        owner_ids = {template.owner_id for template in templates}
+
+    for owner_id in owner_ids:
+        response_cache.bump(owner_id)
+    return len(templates), len(created)
+
+
+def materialize_due(today=None, batch_size=500):
+    """
+    Create every occurrence due on or before today, batch by batch.
+    Returns {'templates': n, 'created': n}.
+    """
+    today = today or date.today()
+    stats = {'templates': 0, 'created': 0}
+    while True:
+        templates, created = run_batch(today, batch_size)
+        if not templates:
+            return stats
+        stats['templates'] += templates
+        stats['created'] += created
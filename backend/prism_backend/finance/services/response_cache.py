@@ -0,0 +1,71 @@
+"""
+Per-user cache of computed responses.
+
+Each user has a version number in the cache; entries are keyed on it, so
+bumping the version on any write orphans every cached response for that
+user at once. Orphaned entries simply expire. Bumps take effect when the
+writing transaction commits. Versions start from the clock rather than 1,
+so a counter that was evicted never comes back with a value that earlier
+entries or ETags were built from.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def version_key(owner_id):
+    return f'finance:version:{owner_id}'
+
+
+def _initial_version():
+    return time.time_ns() // 1000
+
+
+def get_version(owner_id):
+    key = version_key(owner_id)
+    version = cache.get(key)
+    if version is None:
+        version = _initial_version()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def _increment(owner_id):
+    key = version_key(owner_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_version(), None)
+
+
+def bump(owner_id):
+    """
+    Invalidate every cached response for owner_id once the current
+    transaction commits. Bumping earlier would let a concurrent request
+    cache data from before the commit under the new version.
+    """
+    transaction.on_commit(lambda: _increment(owner_id))
+
+
+def response_key(owner_id, name, params=None):
+    """Cache key for a named response, varying on the user's version and params."""
+    key = f'finance:{name}:{owner_id}:v{get_version(owner_id)}'
+    if params:
+        query = urlencode(sorted(params.lists()), doseq=True)
+        digest = hashlib.md5(query.encode(), usedforsecurity=False).hexdigest()
+        key = f'{key}:{digest}'
+    return key
+
+
+def get_or_compute(owner_id, name, compute, params=None, timeout=None):
+    """Return the cached response data for name, computing and storing it on a miss."""
+    key = response_key(owner_id, name, params)
+    data = cache.get(key)
+    if data is None:
+        data = compute()
+        cache.set(key, data, settings.SUMMARY_CACHE_TIMEOUT if timeout is None else timeout)
+    return data
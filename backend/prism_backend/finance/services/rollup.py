@@ -0,0 +1,232 @@
+"""
+Incremental maintenance of the DailyRollup table.
+
+Every write path that changes transactions (model save/delete, bulk
+imports) funnels its changes through ``record_transactions`` or
+``record_change`` so the rollups stay in step with the raw rows.
+
+There is one rollup row per (owner, category, account, day). Deltas are
+applied as an F() increment of that row, or an insert when it does not
+exist yet; an insert that loses a race with a concurrent one fails on the
+unique constraint and falls back to the increment.
+"""
+from collections import defaultdict
+from decimal import Decimal
+from django.db import IntegrityError, transaction as db_transaction
+from django.db.models import Count, F, Q, Sum, Value
+from django.db.models.functions import Abs, Coalesce
+from . import response_cache
+
+ZERO = Decimal('0.00')
+CENT = Decimal('0.01')
+
+ROLLUP_FIELDS = ('owner_id', 'category_id', 'account_id', 'date', 'amount')
+
+
+def _values(txn):
+    """Return the rollup-relevant values of a transaction instance or dict."""
+    if isinstance(txn, dict):
+        return tuple(txn[field] for field in ROLLUP_FIELDS)
+    return tuple(getattr(txn, field) for field in ROLLUP_FIELDS)
+
+
+def _add(deltas, values, sign):
+    owner_id, category_id, account_id, day, amount = values
+    delta = deltas[(owner_id, category_id, account_id, day)]
+    if amount > 0:
+        delta[0] += sign * amount
+    else:
+        delta[1] += sign * -amount
+    delta[2] += sign
+
+
+def _new_deltas():
+    return defaultdict(lambda: [ZERO, ZERO, 0])
+
+
+def _increment(key, income, expense, count):
+    """Add the deltas to the rollup row for key. Returns False if there is no row."""
+    from ..models import DailyRollup
+
+    return DailyRollup.objects.filter(**key).update(
+        income_total=F('income_total') + income,
+        expense_total=F('expense_total') + expense,
+        transaction_count=F('transaction_count') + count,
+    ) > 0
+
+
+def apply_deltas(deltas):
+    """
+    Apply {(owner_id, category_id, account_id, day): [income, expense, count]}
+    deltas to the rollup table using atomic F() increments.
+    """
+    from ..models import DailyRollup
+
+    with db_transaction.atomic():
+        for (owner_id, category_id, account_id, day), (income, expense, count) in deltas.items():
+            if not income and not expense and not count:
+                continue
+
+            key = {
+                'owner_id': owner_id,
+                'category_id': category_id,
+                'account_id': account_id,
+                'day': day,
+            }
+            if _increment(key, income, expense, count):
+                continue
+            # Nothing to decrement: the rows went away with a cascade delete
+            if count <= 0:
+                continue
+            try:
+                with db_transaction.atomic():
+                    DailyRollup.objects.create(
+                        income_total=income,
+                        expense_total=expense,
+                        transaction_count=count,
+                        **key
+                    )
+            except IntegrityError:
+                # A concurrent writer created the row first
+                _increment(key, income, expense, count)
+
+
+def fold_category(category):
+    """
+    Move a category's rollups into the uncategorized rows before the
+    category is deleted, as happens to its transactions.
+    """
+    from ..models import DailyRollup
+
+    rows = DailyRollup.objects.filter(category=category)
+    deltas = _new_deltas()
+    for account_id, day, income, expense, count in rows.values_list(
+        'account_id', 'day', 'income_total', 'expense_total', 'transaction_count'
+    ):
+        delta = deltas[(category.owner_id, None, account_id, day)]
+        delta[0] += income
+        delta[1] += expense
+        delta[2] += count
+
+    with db_transaction.atomic():
+        rows.delete()
+        apply_deltas(deltas)
+
+
+def record_transactions(transactions, sign=1):
+    """Add (sign=1) or remove (sign=-1) a batch of transactions from the rollups."""
+    deltas = _new_deltas()
+    for txn in transactions:
+        _add(deltas, _values(txn), sign)
+    apply_deltas(deltas)
+
+
+def record_change(previous, current):
+    """
+    Move a single transaction's contribution from its previous values
+    (a dict, or None for a new row) to its current values.
+    """
+    deltas = _new_deltas()
+    if previous is not None:
+        _add(deltas, _values(previous), -1)
+    _add(deltas, _values(current), 1)
+    apply_deltas(deltas)
+
+
+def aggregate_transactions(queryset):
+    """Group raw transactions into rollup-shaped rows."""
+    return (
+        queryset.order_by()
+        .values('owner_id', 'category_id', 'account_id', 'date')
+        .annotate(
+            income=Coalesce(Sum('amount', filter=Q(amount__gt=0)), Value(ZERO)),
+            expense=Coalesce(Abs(Sum('amount', filter=Q(amount__lt=0))), Value(ZERO)),
+            count=Count('id'),
+        )
+    )
+
+
+def rebuild(owner=None, batch_size=1000):
+    """
+    Recompute rollups from scratch, optionally for a single owner.
+    Returns the number of rollup rows written.
+    """
+    from ..models import DailyRollup, Transaction
+
+    transactions = Transaction.objects.all()
+    rollups = DailyRollup.objects.all()
+    if owner is not None:
+        transactions = transactions.filter(owner=owner)
+        rollups = rollups.filter(owner=owner)
+
+    written = 0
+    owner_ids = set()
+    with db_transaction.atomic():
+        rollups.delete()
+
+        batch = []
+        for row in aggregate_transactions(transactions).iterator(chunk_size=batch_size):
+            owner_ids.add(row['owner_id'])
+            batch.append(DailyRollup(
+                owner_id=row['owner_id'],
+                category_id=row['category_id'],
+                account_id=row['account_id'],
+                day=row['date'],
+                income_total=row['income'],
+                expense_total=row['expense'],
+                transaction_count=row['count'],
+            ))
+            if len(batch) >= batch_size:
+                DailyRollup.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+
+        if batch:
+            DailyRollup.objects.bulk_create(batch)
+            written += len(batch)
+
+    for owner_id in owner_ids:
+        response_cache.bump(owner_id)
+    return written
+
+
+def verify(owner=None):
+    """
+    Compare rollups against raw transactions.
+    Returns a list of (key, expected, actual) tuples for every mismatch.
+    """
+    from ..models import DailyRollup, Transaction
+
+    transactions = Transaction.objects.all()
+    rollups = DailyRollup.objects.all()
+    if owner is not None:
+        transactions = transactions.filter(owner=owner)
+        rollups = rollups.filter(owner=owner)
+
+    def normalise(income, expense, count):
+        # SQLite sums decimals as floats; compare at cent precision
+        return (Decimal(income or 0).quantize(CENT), Decimal(expense or 0).quantize(CENT), count or 0)
+
+    expected = {
+        (row['owner_id'], row['category_id'], row['account_id'], row['date']):
+            normalise(row['income'], row['expense'], row['count'])
+        for row in aggregate_transactions(transactions)
+    }
+    actual = {
+        (row['owner_id'], row['category_id'], row['account_id'], row['day']):
+            normalise(row['income'], row['expense'], row['count'])
+        for row in rollups.order_by().values('owner_id', 'category_id', 'account_id', 'day').annotate(
+            income=Sum('income_total'),
+            expense=Sum('expense_total'),
+            count=Sum('transaction_count'),
+        )
+    }
+
+    empty = (ZERO, ZERO, 0)
+    mismatches = []
+    for key in expected.keys() | actual.keys():
+        want = expected.get(key, empty)
+        have = actual.get(key, empty)
+        if want != have:
+            mismatches.append((key, want, have))
+    return mismatches
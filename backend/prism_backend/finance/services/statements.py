@@ -0,0 +1,268 @@
+"""
+Streaming import of bank statement files (CSV and OFX).
+
+Statements flow through a generator pipeline:
+
+    parse_csv / parse_ofx -> build_transactions -> batched -> commit_batch
+
+so only one batch of rows is held in memory at a time regardless of file
+size. Lines already present for the owner (same account, date, amount and
+description) are skipped using the indexed ``Transaction.import_hash``.
+Identical lines within one file are counted rather than collapsed, so two
+same-day coffees at the same price both import, and importing that file
+again adds neither.
+"""
+import csv
+import re
+import time
+from collections import Counter
+from datetime import datetime
+from decimal import ROUND_DOWN, Decimal, InvalidOperation
+from django.db import transaction as db_transaction
+from django.db.models import Count
+from ..models import Category, Transaction
+from . import ledger, response_cache, rollup, sync
+
+CSV_COLUMNS = {
+    'date': ('date', 'transaction date', 'posted date', 'posting date', 'value date'),
+    'amount': ('amount', 'transaction amount'),
+    'debit': ('debit', 'withdrawal', 'money out'),
+    'credit': ('credit', 'deposit', 'money in'),
+    'description': ('description', 'payee', 'name', 'memo', 'details'),
+    'notes': ('notes', 'memo', 'reference'),
+    'category': ('category',),
+}
+
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%Y%m%d')
+
+# Only the first few bad lines are reported so the report stays small
+MAX_REPORTED_ERRORS = 100
+
+AMOUNT_FIELD = Transaction._meta.get_field('amount')
+AMOUNT_LIMIT = Decimal(10) ** (AMOUNT_FIELD.max_digits - AMOUNT_FIELD.decimal_places)
+AMOUNT_STEP = Decimal(1).scaleb(-AMOUNT_FIELD.decimal_places)
+
+OFX_TAG = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)')
+
+
+class StatementError(ValueError):
+    """Raised for a statement line that cannot be turned into a transaction."""
+
+
+def detect_format(filename):
+    """Guess the statement format from a file name."""
+    if filename and filename.lower().endswith(('.ofx', '.qfx')):
+        return 'ofx'
+    return 'csv'
+
+
+def parse_date(value, date_format=None):
+    value = value.strip()
+    if date_format:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            raise StatementError(f"Date '{value}' does not match format '{date_format}'")
+    # OFX dates carry a time and timezone suffix: 20240131120000[-5:EST]
+    candidate = value[:8] if re.match(r'^\d{8}', value) else value
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(candidate, fmt).date()
+        except ValueError:
+            continue
+    raise StatementError(f"Unrecognised date '{value}'")
+
+
+def parse_amount(value):
+    cleaned = value.strip().replace(',', '').replace('$', '')
+    negative = cleaned.startswith('(') and cleaned.endswith(')')
+    cleaned = cleaned.strip('()')
+    try:
+        amount = Decimal(cleaned)
+    except InvalidOperation:
+        raise StatementError(f"Unrecognised amount '{value}'")
+    if not amount.is_finite() or abs(amount) >= AMOUNT_LIMIT:
+        raise StatementError(f"Amount '{value}' is out of range")
+    if amount != amount.quantize(AMOUNT_STEP, rounding=ROUND_DOWN):
+        raise StatementError(f"Amount '{value}' has more than {AMOUNT_FIELD.decimal_places} decimal places")
+    return -amount if negative else amount
+
+
+def parse_csv(lines, date_format=None):
+    """Yield normalised row dicts from CSV text lines."""
+    reader = csv.DictReader(lines)
+    if not reader.fieldnames:
+        return
+
+    headers = {name.strip().lower(): name for name in reader.fieldnames if name}
+    columns = {}
+    for field, aliases in CSV_COLUMNS.items():
+        for alias in aliases:
+            if alias in headers and headers[alias] not in columns.values():
+                columns[field] = headers[alias]
+                break
+
+    if 'date' not in columns or 'description' not in columns:
+        raise StatementError('CSV must have date and description columns')
+    if 'amount' not in columns and not ('debit' in columns or 'credit' in columns):
+        raise StatementError('CSV must have an amount column or debit/credit columns')
+
+    for line_number, record in enumerate(reader, start=2):
+        try:
+            if 'amount' in columns:
+                amount = parse_amount(record[columns['amount']] or '0')
+            else:
+                debit = (record.get(columns.get('debit'), '') or '').strip()
+                credit = (record.get(columns.get('credit'), '') or '').strip()
+                amount = parse_amount(credit or '0') - abs(parse_amount(debit or '0'))
+
+            yield {
+                'line': line_number,
+                'date': parse_date(record[columns['date']] or '', date_format),
+                'amount': amount,
+                'description': (record[columns['description']] or '').strip(),
+                'notes': (record.get(columns['notes'], '') or '').strip() if 'notes' in columns else '',
+                'category': (record.get(columns['category'], '') or '').strip() if 'category' in columns else '',
+            }
+        except StatementError as e:
+            yield {'line': line_number, 'error': str(e)}
+
+
+def parse_ofx(lines, date_format=None):
+    """Yield normalised row dicts from OFX (SGML or XML) text lines."""
+    record = None
+    line_number = 0
+    for line_number, line in enumerate(lines, start=1):
+        for closing, tag, value in OFX_TAG.findall(line):
+            tag = tag.upper()
+            if tag == 'STMTTRN':
+                if not closing:
+                    record = {'line': line_number}
+                elif record is not None:
+                    yield _ofx_row(record, date_format)
+                    record = None
+            elif record is not None and not closing:
+                record[tag] = value.strip()
+
+    if record is not None:
+        yield _ofx_row(record, date_format)
+
+
+def _ofx_row(record, date_format):
+    try:
+        description = record.get('NAME') or record.get('MEMO') or record.get('PAYEE') or ''
+        return {
+            'line': record['line'],
+            'date': parse_date(record.get('DTPOSTED', ''), date_format),
+            'amount': parse_amount(record.get('TRNAMT', '')),
+            'description': description,
+            'notes': record.get('MEMO', '') if record.get('NAME') else '',
+            'category': '',
+        }
+    except StatementError as e:
+        return {'line': record['line'], 'error': str(e)}
+
+
+def build_transactions(rows, owner, account, categories, stats):
+    """Turn parsed rows into unsaved Transaction instances."""
+    for row in rows:
+        if 'error' not in row:
+            if not row['description']:
+                row['error'] = 'Missing description'
+            elif row['amount'] == 0:
+                row['error'] = 'Amount cannot be zero'
+
+        if 'error' in row:
+            stats['invalid'] += 1
+            if len(stats['errors']) < MAX_REPORTED_ERRORS:
+                stats['errors'].append({'line': row['line'], 'error': row['error']})
+            continue
+
+        txn = Transaction(
+            owner=owner,
+            account=account,
+            category=categories.get(row['category'].lower()) if row['category'] else None,
+            amount=row['amount'],
+            description=row['description'][:255],
+            date=row['date'],
+            notes=row['notes'],
+        )
+        txn.import_hash = txn.compute_import_hash()
+        yield txn
+
+
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def commit_batch(batch, owner, stored=None, seen=None):
+    """
+    Insert the lines of a batch that are not already stored.
+    Returns (created, duplicates).
+
+    The n-th occurrence of a line in the file is new only when fewer than n
+    matching rows were stored before the import began. ``stored`` and
+    ``seen`` carry those counts across the batches of one file.
+    """
+    stored = Counter() if stored is None else stored
+    seen = Counter() if seen is None else seen
+    with db_transaction.atomic():
+        unknown = {txn.import_hash for txn in batch} - seen.keys()
+        stored.update({
+            row['import_hash']: row['total']
+            for row in Transaction.objects.filter(owner=owner, import_hash__in=unknown)
+            .values('import_hash').annotate(total=Count('id'))
+        })
+
+        fresh = []
+        for txn in batch:
+            seen[txn.import_hash] += 1
+            if seen[txn.import_hash] > stored[txn.import_hash]:
+                fresh.append(txn)
+
+        if fresh:
+            Transaction.objects.bulk_create(fresh)
+            rollup.record_transactions(fresh)
+            ledger.record_transactions(fresh)
+            sync.touch_on_commit(Transaction, [txn.pk for txn in fresh])
+            response_cache.bump(owner.pk)
+
+    return len(fresh), len(batch) - len(fresh)
+
+
+def import_statement(lines, owner, account, file_format='csv', batch_size=500, date_format=None):
+    """
+    Import a statement into ``account`` and return a report with counts
+    and throughput. Each batch is committed on its own.
+    """
+    # Bulk inserts skip Transaction.save(), so run its owner checks up front
+    Transaction(owner=owner, account=account).check_owner_consistency()
+
+    categories = {
+        category.name.lower(): category
+        for category in Category.objects.filter(owner=owner, is_active=True)
+    }
+    stats = {'rows': 0, 'created': 0, 'duplicates': 0, 'invalid': 0, 'errors': []}
+    parser = parse_ofx if file_format == 'ofx' else parse_csv
+
+    stored, seen = Counter(), Counter()
+    started = time.monotonic()
+    transactions = build_transactions(parser(lines, date_format), owner, account, categories, stats)
+    for batch in batched(transactions, batch_size):
+        created, duplicates = commit_batch(batch, owner, stored, seen)
+        stats['rows'] += len(batch)
+        stats['created'] += created
+        stats['duplicates'] += duplicates
+
+    elapsed = time.monotonic() - started
+    stats['rows'] += stats['invalid']
+    stats['seconds'] = round(elapsed, 3)
+    stats['rows_per_second'] = round(stats['rows'] / elapsed, 1) if elapsed > 0 else stats['rows']
+    return stats
@@ -0,0 +1,202 @@
+"""
+"Changes since" feed for offline clients.
+
+A sync token records the point in time the client is current up to. Each
+model is read with one keyset query on (updated_at, id) over the
+(owner, updated_at) index, and deletions come from the Tombstone table.
+When a model has more rows than fit in one response the token also
+records where each unfinished model stopped, so the next request resumes
+there with the same upper bound.
+
+Rows that change while a response is being built may be sent twice; the
+lower bound deliberately overlaps the previous window so that writes whose
+transaction committed late are not missed. Clients upsert by id. Bulk
+inserts can commit long after the rows were stamped, so they restamp
+updated_at once committed (touch_on_commit).
+
+Tombstones are kept for SYNC_TOMBSTONE_RETENTION_DAYS. A token older than
+that could miss deletions, so it is refused and the client starts over
+with a full sync. Deleting a record prunes old tombstones every
+PRUNE_EVERY deletions on average.
+"""
+import base64
+import json
+import random
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.db import transaction as db_transaction
+from django.db.models import Q
+from django.utils import timezone
+
+# How far each window reaches back past the previous token
+OVERLAP = timedelta(seconds=5)
+
+SYNC_MODELS = ('accounts', 'categories', 'transactions', 'budgets', 'goals')
+
+TOMBSTONE_MODELS = {
+    'account': 'accounts',
+    'category': 'categories',
+    'transaction': 'transactions',
+    'budget': 'budgets',
+    'goal': 'goals',
+}
+
+DELETED = 'deleted'
+
+# Each deletion prunes expired tombstones with probability 1/PRUNE_EVERY
+PRUNE_EVERY = 100
+PRUNE_BATCH_SIZE = 1000
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def encode_token(state):
+    payload = json.dumps(state, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_token(token):
+    """Return the state stored in token, or an empty state for a full sync."""
+    if not token:
+        return {}
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(state, dict):
+            raise InvalidToken('Invalid sync token')
+        for key in ('since', 'until'):
+            if state.get(key):
+                state[key] = datetime.fromisoformat(state[key])
+        if state.get('pending'):
+            state['pending'] = {
+                name: (datetime.fromisoformat(position[0]), int(position[1])) if position else None
+                for name, position in state['pending'].items()
+            }
+        return state
+    except (AttributeError, IndexError, TypeError, ValueError, UnicodeError):
+        raise InvalidToken('Invalid sync token')
+
+
+def tombstone_cutoff():
+    """Tombstones older than this may have been pruned."""
+    return timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+
+def prune_tombstones(batch_size=5000, max_batches=None):
+    """
+    Delete tombstones past the retention period in batches, stopping after
+    max_batches if given. Returns the number deleted.
+    """
+    from ..models import Tombstone
+
+    cutoff = tombstone_cutoff()
+    deleted = batches = 0
+    while max_batches is None or batches < max_batches:
+        batch = list(Tombstone.objects.filter(deleted_at__lt=cutoff).values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            break
+        deleted += Tombstone.objects.filter(pk__in=batch).delete()[0]
+        batches += 1
+    return deleted
+
+
+def prune_tombstones_sometimes():
+    if random.randrange(PRUNE_EVERY) == 0:
+        prune_tombstones(batch_size=PRUNE_BATCH_SIZE, max_batches=1)
+
+
+def touch_on_commit(model, pks, batch_size=1000):
+    """
+    Set updated_at on the rows pks to the time the current transaction
+    commits. Rows written early in a long transaction otherwise carry a
+    stamp older than the syncs that ran before it committed.
+    """
+    pks = list(pks)
+
+    def touch():
+        for start in range(0, len(pks), batch_size):
+            model.objects.filter(pk__in=pks[start:start + batch_size]).update(updated_at=timezone.now())
+
+    db_transaction.on_commit(touch)
+
+
+def querysets(owner):
+    """Base queryset per synced model, joined the way the serializers need."""
+    from ..models import Account, Budget, Category, Goal, Transaction
+
+    return {
+        'accounts': Account.objects.filter(owner=owner).select_related('owner'),
+        'categories': Category.objects.filter(owner=owner).select_related('owner', 'parent'),
+        'transactions': Transaction.objects.filter(owner=owner).select_related(
+            'owner', 'account', 'category__parent', 'transfer_to'
+        ),
+        'budgets': Budget.objects.filter(owner=owner).select_related(
+            'owner', 'category__parent'
+        ).with_spending(),
+        'goals': Goal.objects.filter(owner=owner).select_related('owner', 'linked_account'),
+        DELETED: owner.tombstones.all(),
+    }
+
+
+def _page(queryset, field, since, until, after, limit):
+    queryset = queryset.filter(**{f'{field}__lte': until})
+    if since:
+        queryset = queryset.filter(**{f'{field}__gt': since - OVERLAP})
+    if after:
+        stamp, pk = after
+        queryset = queryset.filter(Q(**{f'{field}__gt': stamp}) | Q(**{field: stamp, 'id__gt': pk}))
+    rows = list(queryset.order_by(field, 'id')[:limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+def changes(owner, token=None, limit=500):
+    """
+    Return the records changed for owner since token:
+    {'changes': {model: [instances]}, 'deleted': {model: [ids]},
+     'has_more': bool, 'next': token}
+    At most ``limit`` rows are read per model.
+    """
+    state = decode_token(token)
+    since = state.get('since')
+    if since and since < tombstone_cutoff():
+        raise InvalidToken('Sync token has expired, start a full sync')
+    until = state.get('until') or timezone.now()
+
+    # Streams still to read and where each stopped; a full sync needs no tombstones
+    pending = state.get('pending') or {name: None for name in SYNC_MODELS + ((DELETED,) if since else ())}
+    unknown = set(pending) - set(SYNC_MODELS) - {DELETED}
+    if unknown:
+        raise InvalidToken('Invalid sync token')
+
+    result = {'changes': {name: [] for name in SYNC_MODELS}, 'deleted': {name: [] for name in SYNC_MODELS}}
+    remaining = {}
+    for name, queryset in querysets(owner).items():
+        if name not in pending:
+            continue
+        field = 'deleted_at' if name == DELETED else 'updated_at'
+        rows, more = _page(queryset, field, since, until, pending[name], limit)
+
+        if name == DELETED:
+            for tombstone in rows:
+                result['deleted'][TOMBSTONE_MODELS[tombstone.model]].append(tombstone.object_id)
+        else:
+            result['changes'][name] = rows
+
+        if more:
+            last = rows[-1]
+            remaining[name] = [getattr(last, field).isoformat(), last.pk]
+
+    if remaining:
+        next_state = {
+            'since': since.isoformat() if since else None,
+            'until': until.isoformat(),
+            'pending': remaining,
+        }
+    else:
+        next_state = {'since': until.isoformat()}
+
+    result['has_more'] = bool(remaining)
+    result['next'] = encode_token(next_state)
+    return result
@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from .models import Account, Budget, Category, Goal, Tombstone, Transaction
+from .services import ledger, response_cache, rollup, sync
+
+
+@receiver(post_delete, sender=Transaction)
+def remove_transaction_from_rollups(sender, instance, **kwargs):
+    """Keep rollups in step with deletes, including cascades and queryset deletes."""
+    rollup.record_transactions([instance], sign=-1)
+
+
+@receiver(pre_delete, sender=Category)
+def fold_category_rollups(sender, instance, **kwargs):
+    """Move the category's rollups to uncategorized before SET_NULL would collide with them."""
+    rollup.fold_category(instance)
+
+
+@receiver(post_delete, sender=Transaction)
+def reverse_transaction_balance(sender, instance, **kwargs):
+    """Reverse the transaction's effect on its account balances."""
+    ledger.record_transactions([instance], sign=-1)
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_save, sender=Budget)
+@receiver(post_delete, sender=Budget)
+@receiver(post_save, sender=Goal)
+@receiver(post_delete, sender=Goal)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_cached_responses(sender, instance, **kwargs):
+    """Bump the owner's cache version so cached summaries are recomputed."""
+    response_cache.bump(instance.owner_id)
+
+
+@receiver(post_delete, sender=Account)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_delete, sender=Budget)
+@receiver(post_delete, sender=Goal)
+@receiver(post_delete, sender=Category)
+def record_tombstone(sender, instance, origin=None, **kwargs):
+    """Leave a tombstone for sync clients, unless the whole user is going away."""
+    if isinstance(origin, get_user_model()):
+        return
+    Tombstone.objects.create(
+        owner_id=instance.owner_id,
+        model=sender._meta.model_name,
+        object_id=instance.pk,
+    )
+    sync.prune_tombstones_sometimes()
@@ -1,3 +1,1127 @@
-from django.test import TestCase
+import csv
+import json
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+from django.core.cache import cache, caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from prism_backend.core.testing import UserTestCase, create_user
+from .models import Account, Budget, Category, DailyRollup, Goal, Tombstone, Transaction
 
-# Create your tests here.
+
+class QueryBudgetMixin:
+    """
+    Assert that an endpoint stays within a fixed number of queries,
+    independent of how many rows it returns.
+    """
+
+    def assertQueryBudget(self, url, budget, method='get', **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(url, **kwargs)
+        self.assertLess(response.status_code, 400, response.content)
+        queries = len(context.captured_queries)
+        self.assertLessEqual(
+            queries,
+            budget,
+            f"{method.upper()} {url} ran {queries} queries (budget {budget}):\n"
+            + '\n'.join(query['sql'] for query in context.captured_queries)
+        )
+        return response
+
+
+class FinanceDataTestCase(QueryBudgetMixin, UserTestCase):
+    """Two accounts and a parent category, with add_rows() to fill in data."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.account = Account.objects.create(owner=self.user, name='Checking', account_type='checking')
+        self.savings = Account.objects.create(owner=self.user, name='Savings', account_type='savings')
+        self.parent = Category.objects.create(owner=self.user, name='Living')
+
+    def add_rows(self, count):
+        start = Transaction.objects.count()
+        for i in range(start, start + count):
+            category = Category.objects.create(owner=self.user, name=f'Category {i}', parent=self.parent)
+            Transaction.objects.create(
+                owner=self.user,
+                account=self.account,
+                category=category,
+                amount=Decimal('-10.00'),
+                description=f'Purchase {i}',
+                date=date(2024, 1, 1) + timedelta(days=i),
+            )
+            Transaction.objects.create(
+                owner=self.user,
+                account=self.account,
+                transfer_to=self.savings,
+                amount=Decimal('-5.00'),
+                description=f'Transfer {i}',
+                date=date(2024, 1, 1) + timedelta(days=i),
+            )
+            Budget.objects.create(
+                owner=self.user,
+                category=category,
+                name=f'Budget {i}',
+                amount=Decimal('100.00'),
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 12, 31),
+            )
+            Goal.objects.create(
+                owner=self.user,
+                name=f'Goal {i}',
+                target_amount=Decimal('1000.00'),
+                linked_account=self.savings,
+            )
+
+
+class ListQueryBudgetTests(FinanceDataTestCase):
+    """List endpoints must not issue per-row queries."""
+
+    def assertConstantQueries(self, url, budget):
+        self.add_rows(2)
+        self.assertQueryBudget(url, budget)
+        self.add_rows(8)
+        self.assertQueryBudget(url, budget)
+
+    def test_transaction_list(self):
+        self.assertConstantQueries('/api/v1/transactions/', 3)
+
+    def test_transaction_keyset_list(self):
+        self.assertConstantQueries('/api/v1/transactions/?cursor=', 2)
+
+    def test_budget_list(self):
+        self.assertConstantQueries('/api/v1/budgets/', 3)
+
+    def test_budget_current(self):
+        self.assertConstantQueries('/api/v1/budgets/current/', 2)
+
+    def test_goal_list(self):
+        self.assertConstantQueries('/api/v1/goals/', 3)
+
+    def test_goal_near_target(self):
+        for count in (2, 8):
+            self.add_rows(count)
+            Goal.objects.update(current_amount=Decimal('900.00'))
+            response = self.assertQueryBudget('/api/v1/goals/near_target/', 2)
+            self.assertEqual(response.data['count'], Goal.objects.count())
+
+    def test_budget_over_budget(self):
+        for count in (2, 8):
+            self.add_rows(count)
+            Budget.objects.update(amount=Decimal('5.00'))
+            response = self.assertQueryBudget('/api/v1/budgets/over_budget/', 2)
+            self.assertEqual(response.data['count'], Budget.objects.count())
+
+    def test_account_list(self):
+        self.assertConstantQueries('/api/v1/accounts/', 3)
+
+    def test_category_list(self):
+        self.assertConstantQueries('/api/v1/categories/', 4)
+
+    def test_category_tree(self):
+        self.add_rows(5)
+        self.assertQueryBudget('/api/v1/categories/tree/', 1)
+        # Served from the per-user cache until a category changes
+        self.assertQueryBudget('/api/v1/categories/tree/', 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(owner=self.user, name='Fresh', parent=self.parent)
+        response = self.assertQueryBudget('/api/v1/categories/tree/', 1)
+        children = response.data['results'][0]['subcategories']
+        self.assertIn('Fresh', [child['name'] for child in children])
+
+    def test_cashflow(self):
+        url = '/api/v1/analytics/cashflow/?interval=week&start_date=2024-01-01&end_date=2024-03-31&breakdown=category'
+        self.assertConstantQueries(url, 1)
+
+
+class TransactionSummaryTests(FinanceDataTestCase):
+    def setUp(self):
+        super().setUp()
+        self.add_rows(2)
+        Transaction.objects.create(
+            owner=self.user, account=self.savings, amount=Decimal('250.00'), description='Salary', date=date(2024, 2, 1),
+        )
+
+    def groups(self, group_by):
+        response = self.client.get(f'/api/v1/transactions/summary/?group_by={group_by}')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data['groups']
+
+    def test_group_by_category(self):
+        # Where the uncategorized group sorts depends on the database
+        groups = {g['category_name']: g for g in self.groups('category')}
+        self.assertEqual(
+            {name: (g['total_transactions'], g['total_income'], g['total_expenses']) for name, g in groups.items()},
+            {
+                'Category 0': (1, '0.00', '10.00'),
+                'Category 1': (1, '0.00', '10.00'),
+                None: (3, '250.00', '10.00'),
+            },
+        )
+        self.assertIsNone(groups[None]['category'])
+        self.assertEqual(groups[None]['transfer_transactions'], 2)
+
+    def test_group_by_account(self):
+        groups = self.groups('account')
+        self.assertEqual(
+            [(g['account'], g['account_name'], g['net_income']) for g in groups],
+            [(self.account.pk, 'Checking', '-30.00'), (self.savings.pk, 'Savings', '250.00')],
+        )
+        self.assertNotIn('category', groups[0])
+
+    def test_group_by_month(self):
+        groups = self.groups('month')
+        self.assertEqual(
+            [(g['month'], g['total_transactions'], g['net_income']) for g in groups],
+            [('2024-01-01', 4, '-30.00'), ('2024-02-01', 1, '250.00')],
+        )
+
+    def test_group_by_category_and_month(self):
+        groups = self.groups('category,month')
+        self.assertEqual(
+            {(g['category_name'], g['month']): g['total_transactions'] for g in groups},
+            {
+                ('Category 0', '2024-01-01'): 1,
+                ('Category 1', '2024-01-01'): 1,
+                (None, '2024-01-01'): 2,
+                (None, '2024-02-01'): 1,
+            },
+        )
+        self.assertEqual(len(groups), 4)
+
+    def test_unknown_dimension(self):
+        response = self.client.get('/api/v1/transactions/summary/?group_by=category,weather')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('weather', response.data['error'])
+
+
+class CashflowTests(FinanceDataTestCase):
+    def test_buckets_are_filled_and_gap_filled(self):
+        self.add_rows(3)
+        Transaction.objects.create(
+            owner=self.user, account=self.account, amount=Decimal('100.00'), description='Salary', date=date(2024, 1, 20),
+        )
+
+        response = self.client.get(
+            '/api/v1/analytics/cashflow/?interval=week&start_date=2024-01-01&end_date=2024-01-28&breakdown=category'
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            [(bucket['period'], bucket['income'], bucket['expenses'], bucket['net']) for bucket in response.data['buckets']],
+            [
+                ('2024-01-01', '0.00', '45.00', '-45.00'),
+                ('2024-01-08', '0.00', '0.00', '0.00'),
+                ('2024-01-15', '100.00', '0.00', '100.00'),
+                ('2024-01-22', '0.00', '0.00', '0.00'),
+            ],
+        )
+
+        breakdown = {group['name']: group['buckets'] for group in response.data['breakdown']}
+        self.assertEqual(set(breakdown), {None, 'Category 0', 'Category 1', 'Category 2'})
+        self.assertEqual([bucket['expenses'] for bucket in breakdown['Category 1']], ['10.00', '0.00', '0.00', '0.00'])
+        self.assertEqual([bucket['net'] for bucket in breakdown[None]], ['-15.00', '0.00', '100.00', '0.00'])
+
+
+class SummaryTests(FinanceDataTestCase):
+    """Summary endpoints aggregate in a single grouped query."""
+
+    def test_account_and_goal_summaries(self):
+        for count in (2, 8):
+            self.add_rows(count)
+            cache.clear()
+            accounts = self.assertQueryBudget('/api/v1/accounts/summary/', 1).data
+            goals = self.assertQueryBudget('/api/v1/goals/summary/', 1).data
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Account.objects.create(owner=self.user, name='Old', account_type='savings', is_active=False)
+            Goal.objects.create(
+                owner=self.user,
+                name='Done',
+                target_amount=Decimal('50.00'),
+                current_amount=Decimal('50.00'),
+            )
+        accounts = self.client.get('/api/v1/accounts/summary/').data
+        self.assertEqual(accounts['total_accounts'], 3)
+        self.assertEqual(accounts['active_accounts'], 2)
+        self.assertEqual(accounts['by_type']['savings']['count'], 2)
+        self.assertEqual(accounts['by_type']['checking']['balance'], Decimal('-150.00'))
+        self.assertEqual(accounts['total_balance'], '-100.00')
+
+        goals = self.client.get('/api/v1/goals/summary/').data
+        self.assertEqual(goals['total_goals'], 11)
+        self.assertEqual(goals['active_goals'], 10)
+        self.assertEqual(goals['completed_goals'], 1)
+        self.assertEqual(goals['total_target_amount'], '10050.00')
+        self.assertEqual(goals['by_type']['savings']['count'], 11)
+        self.assertEqual(goals['by_type']['savings']['target_amount'], '10050.00')
+
+
+class ResponseCacheTests(FinanceDataTestCase):
+    """Cached responses are served until the owner writes."""
+
+    def test_summaries_cached_until_write(self):
+        self.add_rows(3)
+        urls = [
+            '/api/v1/accounts/summary/',
+            '/api/v1/budgets/summary/',
+            '/api/v1/goals/summary/',
+            '/api/v1/transactions/summary/?group_by=month',
+        ]
+        for url in urls:
+            self.client.get(url)
+            self.assertQueryBudget(url, 0)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Transaction.objects.create(
+                owner=self.user,
+                account=self.account,
+                amount=Decimal('250.00'),
+                description='Salary',
+                date=date(2024, 1, 1),
+            )
+            # Not invalidated until the write commits
+            self.assertQueryBudget('/api/v1/transactions/summary/?group_by=month', 0)
+        for callback in callbacks:
+            callback()
+
+        response = self.client.get('/api/v1/transactions/summary/?group_by=month')
+        self.assertEqual(response.data['total_income'], '250.00')
+        response = self.client.get('/api/v1/accounts/summary/')
+        self.assertEqual(response.data['total_balance'], '220.00')
+
+    def test_filtered_summary_cached_separately(self):
+        self.add_rows(2)
+        Budget.objects.filter(name='Budget 1').update(start_date=date(2024, 6, 1))
+
+        self.assertEqual(self.client.get('/api/v1/budgets/summary/').data['total_budgets'], 2)
+        response = self.client.get('/api/v1/budgets/summary/?start_date=2024-02-01')
+        self.assertEqual(response.data['total_budgets'], 1)
+
+
+class ConditionalGetTests(FinanceDataTestCase):
+    """Unchanged GETs answer 304 without touching the database."""
+
+    def test_conditional_get(self):
+        self.add_rows(3)
+        for url in ['/api/v1/transactions/', '/api/v1/budgets/summary/', f'/api/v1/accounts/{self.account.pk}/']:
+            etag = self.client.get(url)['ETag']
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(len(context.captured_queries), 0)
+
+        etag = self.client.get('/api/v1/transactions/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_rows(1)
+        response = self.client.get('/api/v1/transactions/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_write_on_another_worker_changes_etag(self):
+        from .services import response_cache
+
+        # Each worker process holds its own connection to the shared cache
+        with tempfile.TemporaryDirectory() as directory, override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory},
+        }):
+            worker_a = caches.create_connection('default')
+            worker_b = caches.create_connection('default')
+
+            with patch.object(response_cache, 'cache', worker_a):
+                etag = self.client.get('/api/v1/transactions/')['ETag']
+
+            with patch.object(response_cache, 'cache', worker_b), self.captureOnCommitCallbacks(execute=True):
+                self.add_rows(1)
+
+            with patch.object(response_cache, 'cache', worker_a):
+                response = self.client.get('/api/v1/transactions/', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+
+
+class DashboardTests(FinanceDataTestCase):
+    """The dashboard assembles every widget in one request."""
+
+    def test_dashboard(self):
+        self.add_rows(3)
+        response = self.assertQueryBudget('/api/v1/dashboard/', 6)
+        self.assertQueryBudget('/api/v1/dashboard/', 0)
+        for name, url in [
+            ('account_summary', '/api/v1/accounts/summary/'),
+            ('transaction_summary', '/api/v1/transactions/summary/'),
+            ('recent_transactions', '/api/v1/transactions/recent/'),
+            ('current_budgets', '/api/v1/budgets/current/'),
+            ('budget_summary', '/api/v1/budgets/summary/'),
+            ('goal_summary', '/api/v1/goals/summary/'),
+        ]:
+            self.assertEqual(response.data[name], self.client.get(url).data, name)
+
+        response = self.assertQueryBudget('/api/v1/dashboard/?include=goal_summary,account_summary', 2)
+        self.assertEqual(list(response.data), ['account_summary', 'goal_summary'])
+        response = self.client.get('/api/v1/dashboard/?include=weather')
+        self.assertEqual(response.status_code, 400)
+
+
+class CategoryPathTests(UserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.account = Account.objects.create(owner=self.user, name='Checking', account_type='checking')
+        self.living = Category.objects.create(owner=self.user, name='Living')
+        self.food = Category.objects.create(owner=self.user, name='Food', parent=self.living)
+        self.groceries = Category.objects.create(owner=self.user, name='Groceries', parent=self.food)
+        self.fun = Category.objects.create(owner=self.user, name='Fun')
+
+    def spending(self, category, query=''):
+        response = self.client.get(f'/api/v1/categories/{category.pk}/spending/{query}')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data['total_expenses']
+
+    def test_move_subtree(self):
+        for day in (1, 2):
+            Transaction.objects.create(
+                owner=self.user, account=self.account, category=self.groceries, amount=Decimal('-10.00'),
+                description='Shop', date=date(2024, 1, day),
+            )
+        self.assertEqual(self.spending(self.living), '20.00')
+        self.assertEqual(self.spending(self.living, '?start_date=2024-01-02&end_date=bad'), '10.00')
+
+        response = self.client.patch(f'/api/v1/categories/{self.food.pk}/', {'parent': self.fun.pk}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.groceries.refresh_from_db()
+        self.assertEqual(self.groceries.path, f'/{self.fun.pk}/{self.food.pk}/{self.groceries.pk}/')
+        self.assertEqual(set(self.fun.descendants()), {self.fun, self.food, self.groceries})
+        self.assertEqual(set(self.living.descendants()), {self.living})
+        self.assertEqual(self.spending(self.living), '0.00')
+        self.assertEqual(self.spending(self.fun), '20.00')
+
+    def test_move_below_itself(self):
+        response = self.client.patch(f'/api/v1/categories/{self.living.pk}/', {'parent': self.groceries.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        self.living.parent = self.groceries
+        with self.assertRaises(ValueError):
+            self.living.save()
+        self.groceries.refresh_from_db()
+        self.assertEqual(self.groceries.path, f'/{self.living.pk}/{self.food.pk}/{self.groceries.pk}/')
+
+
+class ExportTests(UserTestCase):
+    def setUp(self):
+        super().setUp()
+        checking = Account.objects.create(owner=self.user, name='Checking', account_type='checking')
+        savings = Account.objects.create(owner=self.user, name='Savings', account_type='savings')
+        food = Category.objects.create(owner=self.user, name='Food')
+        self.account = checking
+        for day, account, category, amount, description in [
+            (1, checking, food, '-4.50', 'Coffee, large'),
+            (2, checking, None, '1200.00', 'Salary'),
+            (3, savings, None, '5.00', 'Interest'),
+            (9, checking, food, '-30.00', 'Groceries'),
+        ]:
+            Transaction.objects.create(
+                owner=self.user, account=account, category=category, amount=Decimal(amount),
+                description=description, date=date(2024, 1, day),
+            )
+
+    def export(self, query):
+        response = self.client.get(f'/api/v1/transactions/export/{query}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv(self):
+        from .views import TransactionViewSet
+
+        with patch.object(TransactionViewSet, 'export_chunk_size', 1):
+            response, content = self.export(f'?account={self.account.pk}&end_date=2024-01-05&ordering=date')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('transactions.csv', response['Content-Disposition'])
+
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual(
+            [(row['date'], row['description'], row['amount'], row['account'], row['category']) for row in rows],
+            [
+                ('2024-01-01', 'Coffee, large', '-4.50', 'Checking', 'Food'),
+                ('2024-01-02', 'Salary', '1200.00', 'Checking', ''),
+            ],
+        )
+
+    def test_ndjson_and_bad_format(self):
+        response, content = self.export('?export_format=ndjson&search=interest')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([(row['description'], row['amount']) for row in rows], [('Interest', '5.00')])
+
+        response = self.client.get('/api/v1/transactions/export/?export_format=xml')
+        self.assertEqual(response.status_code, 400)
+
+
+class LedgerTests(UserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.checking = Account.objects.create(
+            owner=self.user, name='Checking', account_type='checking', balance=Decimal('100.00')
+        )
+        self.savings = Account.objects.create(owner=self.user, name='Savings', account_type='savings')
+
+    def assertBalances(self, checking, savings):
+        self.checking.refresh_from_db()
+        self.savings.refresh_from_db()
+        self.assertEqual((self.checking.balance, self.savings.balance), (Decimal(checking), Decimal(savings)))
+
+    def test_create_update_delete(self):
+        txn = Transaction.objects.create(
+            owner=self.user, account=self.checking, amount=Decimal('-10.00'), description='Shop', date=date(2024, 1, 1),
+        )
+        self.assertBalances('90.00', '0.00')
+
+        txn.amount = Decimal('-25.00')
+        txn.save()
+        self.assertBalances('75.00', '0.00')
+
+        txn.account = self.savings
+        txn.save()
+        self.assertBalances('100.00', '-25.00')
+
+        txn.delete()
+        self.assertBalances('100.00', '0.00')
+
+    def test_transfer(self):
+        txn = Transaction.objects.create(
+            owner=self.user, account=self.checking, transfer_to=self.savings, amount=Decimal('-60.00'),
+            description='Transfer', date=date(2024, 1, 1),
+        )
+        self.assertBalances('40.00', '60.00')
+
+        txn.transfer_to = None
+        txn.save()
+        self.assertBalances('40.00', '0.00')
+
+        txn.transfer_to = self.savings
+        txn.save()
+        Transaction.objects.filter(pk=txn.pk).delete()
+        self.assertBalances('100.00', '0.00')
+
+    def test_stale_balance_in_update_is_ignored(self):
+        stale = self.client.get(f'/api/v1/accounts/{self.checking.pk}/').data
+        Transaction.objects.create(
+            owner=self.user, account=self.checking, amount=Decimal('-10.00'), description='Shop', date=date(2024, 1, 1),
+        )
+
+        response = self.client.put(f'/api/v1/accounts/{self.checking.pk}/', {**stale, 'name': 'Current'}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data['balance'], '90.00')
+        self.assertBalances('90.00', '0.00')
+        self.assertEqual((self.checking.name, self.checking.opening_balance), ('Current', Decimal('100.00')))
+
+        response = self.client.post(
+            f'/api/v1/accounts/{self.checking.pk}/adjust_balance/', {'balance': '50.00'}, format='json'
+        )
+        self.assertEqual(response.data['balance'], '50.00')
+        self.checking.refresh_from_db()
+        self.assertEqual((self.checking.balance, self.checking.opening_balance), (Decimal('50.00'), Decimal('60.00')))
+
+    def test_reconcile_balances(self):
+        from .services import ledger
+
+        Transaction.objects.create(
+            owner=self.user, account=self.checking, transfer_to=self.savings, amount=Decimal('-60.00'),
+            description='Transfer', date=date(2024, 1, 1),
+        )
+        Account.objects.filter(pk=self.savings.pk).update(balance=Decimal('75.00'))
+
+        drifted = ledger.reconcile(Account.objects.all(), dry_run=True)
+        self.assertEqual(
+            [(account.pk, stored, expected) for account, stored, expected in drifted],
+            [(self.savings.pk, Decimal('75.00'), Decimal('60.00'))],
+        )
+        self.assertBalances('40.00', '75.00')
+
+        out = StringIO()
+        call_command('reconcile_balances', user=self.user.email, stdout=out)
+        self.assertIn('Corrected 1 accounts', out.getvalue())
+        self.assertBalances('40.00', '60.00')
+        self.assertEqual(ledger.reconcile(Account.objects.all()), [])
+
+
+class RollupTests(UserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.account = Account.objects.create(owner=self.user, name='Checking', account_type='checking')
+        self.category = Category.objects.create(owner=self.user, name='Food')
+
+    def add_transaction(self, amount, category=None):
+        return Transaction.objects.create(
+            owner=self.user, account=self.account, category=category, amount=Decimal(amount),
+            description='Shop', date=date(2024, 1, 1),
+        )
+
+    def test_one_row_per_key(self):
+        from .services import rollup
+
+        self.add_transaction('-10.00', self.category)
+        self.add_transaction('-5.00', self.category)
+        self.add_transaction('20.00')
+        self.assertEqual(
+            set(DailyRollup.objects.values_list('category_id', 'income_total', 'expense_total', 'transaction_count')),
+            {(self.category.pk, Decimal('0.00'), Decimal('15.00'), 2), (None, Decimal('20.00'), Decimal('0.00'), 1)},
+        )
+        self.assertEqual(rollup.verify(), [])
+
+    def test_category_delete_folds_into_uncategorized(self):
+        from .services import rollup
+
+        self.add_transaction('-10.00', self.category)
+        self.add_transaction('-5.00')
+        self.category.delete()
+
+        row = DailyRollup.objects.get()
+        self.assertIsNone(row.category_id)
+        self.assertEqual((row.expense_total, row.transaction_count), (Decimal('15.00'), 2))
+        self.assertEqual(rollup.verify(), [])
+
+    def test_verify_and_rebuild(self):
+        from .services import rollup
+
+        self.add_transaction('-10.00', self.category)
+        DailyRollup.objects.update(expense_total=Decimal('99.00'))
+        self.assertEqual(
+            rollup.verify(),
+            [((self.user.pk, self.category.pk, self.account.pk, date(2024, 1, 1)),
+              (Decimal('0.00'), Decimal('10.00'), 1), (Decimal('0.00'), Decimal('99.00'), 1))],
+        )
+        with self.assertRaises(CommandError):
+            call_command('rebuild_rollups', verify=True, stdout=StringIO())
+
+        call_command('rebuild_rollups', user=self.user.email, stdout=StringIO())
+        self.assertEqual(rollup.verify(), [])
+        self.assertEqual(DailyRollup.objects.get().expense_total, Decimal('10.00'))
+
+
+class BulkCreateTests(UserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.account = Account.objects.create(owner=self.user, name='Checking', account_type='checking')
+
+    def row(self, **fields):
+        return {'account_id': self.account.pk, 'amount': '-10.00', 'description': 'Shop', 'date': '2024-01-31', **fields}
+
+    def bulk(self, rows):
+        return self.client.post('/api/v1/transactions/bulk/', rows, format='json')
+
+    def test_create(self):
+        rows = [self.row(), self.row(amount='250.00'), self.row(is_recurring=True, recurring_frequency='monthly')]
+        with override_settings(TRANSACTION_BULK_BATCH_SIZE=2):
+            response = self.bulk(rows)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.data['count'], 3)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('230.00'))
+        template = Transaction.objects.get(is_recurring=True)
+        self.assertEqual(template.next_run_date, date(2024, 2, 29))
+        self.assertEqual(template.import_hash, template.compute_import_hash())
+
+    def test_invalid_rows_create_nothing(self):
+        other = Account.objects.create(
+            owner=create_user('other@example.com'), name='Other', account_type='checking'
+        )
+        response = self.bulk([self.row(), self.row(account_id=other.pk), self.row(date='someday')])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_limits(self):
+        self.assertEqual(self.bulk({'rows': []}).status_code, 400)
+        with override_settings(TRANSACTION_BULK_MAX_ROWS=2):
+            self.assertEqual(self.bulk([self.row()] * 3).status_code, 400)
+        with override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=100):
+            self.assertEqual(self.bulk([self.row()] * 3).status_code, 413)
+        self.assertFalse(Transaction.objects.exists())
+
+
+class KeysetPaginationTests(UserTestCase):
+    def setUp(self):
+        super().setUp()
+        account = Account.objects.create(owner=self.user, name='Checking', account_type='checking')
+        for i in range(7):
+            Transaction.objects.create(
+                owner=self.user, account=account, amount=Decimal('-1.00'), description=f'Row {i}',
+                date=date(2024, 1, 1) if i < 5 else date(2024, 1, 2),
+            )
+        # Rows that tie on both date and created_at are split by id alone
+        Transaction.objects.update(created_at=timezone.now())
+
+    def test_walk_all_pages(self):
+        from .pagination import TransactionPagination
+
+        seen, url = [], '/api/v1/transactions/?cursor='
+        with patch.object(TransactionPagination, 'page_size', 3):
+            while url:
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                seen.extend(row['id'] for row in response.data['results'])
+                url = response.data['next']
+                if url:
+                    self.assertIn(response.data['next_cursor'], url)
+
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next_cursor'])
+        expected = list(Transaction.objects.order_by('-date', '-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_exact_last_page(self):
+        from .pagination import TransactionPagination
+
+        with patch.object(TransactionPagination, 'page_size', 7):
+            response = self.client.get('/api/v1/transactions/?cursor=')
+        self.assertEqual(len(response.data['results']), 7)
+        self.assertIsNone(response.data['next'])
+        self.assertIsNone(response.data['next_cursor'])
+
+    def test_malformed_cursor(self):
+        for cursor in ('not-a-cursor', 'WzEsMl0', 'eyJhIjogMX0', '%C3%A9'):
+            response = self.client.get(f'/api/v1/transactions/?cursor={cursor}')
+            self.assertEqual(response.status_code, 404, cursor)
+
+
+class StatementImportTests(UserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.account = Account.objects.create(owner=self.user, name='Checking', account_type='checking')
+
+    def upload(self, content, name='statement.csv', **data):
+        return self.client.post(
+            '/api/v1/transactions/import/',
+            {'file': SimpleUploadedFile(name, content.encode()), 'account_id': self.account.pk, **data},
+            format='multipart',
+        )
+
+    def test_csv_and_ofx(self):
+        response = self.upload(
+            'Posted Date,Payee,Debit,Credit\n'
+            '2024-01-02,Coffee,4.50,\n'
+            '03/01/2024,Salary,,"1,200.00"\n'
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(
+            set(Transaction.objects.values_list('date', 'amount', 'description')),
+            {(date(2024, 1, 2), Decimal('-4.50'), 'Coffee'), (date(2024, 1, 3), Decimal('1200.00'), 'Salary')},
+        )
+
+        response = self.upload(
+            '<OFX><STMTTRN><DTPOSTED>20240105120000[-5:EST]<TRNAMT>-20.00<NAME>Books</STMTTRN></OFX>',
+            name='statement.ofx',
+        )
+        self.assertEqual(response.data['created'], 1)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('1175.50'))
+
+    def test_identical_lines_are_kept_and_reimport_is_skipped(self):
+        from .services import statements
+
+        lines = ['Date,Description,Amount\n'] + ['2024-01-02,Coffee,-4.50\n'] * 3
+        report = statements.import_statement(lines[:3], self.user, self.account, batch_size=1)
+        self.assertEqual((report['created'], report['duplicates']), (2, 0))
+
+        report = statements.import_statement(lines, self.user, self.account, batch_size=1)
+        self.assertEqual((report['created'], report['duplicates']), (1, 2))
+        self.assertEqual(Transaction.objects.filter(description='Coffee').count(), 3)
+
+        response = self.upload(''.join(lines))
+        self.assertEqual((response.data['created'], response.data['duplicates']), (0, 3))
+
+    def test_bad_lines_are_reported(self):
+        response = self.upload(
+            'Date,Description,Amount\n'
+            '2024-01-02,Coffee,-4.50\n'
+            '02/01/2024,Tea,-3.00\n'
+            '2024-01-03,Void,NaN\n'
+            '2024-01-03,Lottery,1e20\n'
+            '2024-01-03,Fraction,-1.005\n',
+            date_format='%Y-%m-%d',
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual((response.data['created'], response.data['invalid']), (1, 4))
+        self.assertEqual([error['line'] for error in response.data['errors']], [3, 4, 5, 6])
+
+    def test_unusable_file(self):
+        response = self.upload('Date,Amount\n2024-01-02,-4.50\n')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.data)
+        self.assertFalse(Transaction.objects.exists())
+
+
+class SyncTests(UserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.account = Account.objects.create(owner=self.user, name='Checking', account_type='checking')
+
+    def add_transaction(self, description):
+        return Transaction.objects.create(
+            owner=self.user,
+            account=self.account,
+            amount=Decimal('-10.00'),
+            description=description,
+            date=date(2024, 1, 1),
+        )
+
+    def sync(self, token=None):
+        url = '/api/v1/sync/' + (f'?since={token}' if token else '')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data
+
+    def test_full_then_delta(self):
+        first = self.add_transaction('First')
+        second = self.add_transaction('Second')
+
+        data = self.sync()
+        self.assertFalse(data['has_more'])
+        self.assertEqual({row['id'] for row in data['changes']['transactions']}, {first.pk, second.pk})
+
+        deleted_id = first.pk
+        first.delete()
+        third = self.add_transaction('Third')
+        data = self.sync(data['next'])
+        self.assertIn(third.pk, {row['id'] for row in data['changes']['transactions']})
+        self.assertEqual(data['deleted']['transactions'], [deleted_id])
+
+    def test_continuation(self):
+        from .views import SyncViewSet
+
+        created = {self.add_transaction(f'Row {i}').pk for i in range(5)}
+        seen, token = set(), None
+        with patch.object(SyncViewSet, 'page_size', 2):
+            while True:
+                data = self.sync(token)
+                seen.update(row['id'] for row in data['changes']['transactions'])
+                token = data['next']
+                if not data['has_more']:
+                    break
+        self.assertEqual(seen, created)
+
+    def test_invalid_token(self):
+        response = self.client.get('/api/v1/sync/?since=not-a-token')
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_rows_restamped_on_commit(self):
+        token = self.sync()['next']
+        rows = [{'account_id': self.account.pk, 'amount': '-1.00', 'description': 'Bulk', 'date': '2024-01-01'}]
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.post('/api/v1/transactions/bulk/', rows * 2, format='json')
+        # As if the insert ran long before its transaction committed
+        Transaction.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(self.sync(token)['changes']['transactions'], [])
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(self.sync(token)['changes']['transactions']), 2)
+
+    def test_expired_token_and_tombstones(self):
+        from .services import sync
+
+        self.add_transaction('Old').delete()
+        token = self.sync()['next']
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=91))
+
+        with override_settings(SYNC_TOMBSTONE_RETENTION_DAYS=90):
+            response = self.client.get(f'/api/v1/sync/?since={token}')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(sync.prune_tombstones(), 1)
+            with patch('django.utils.timezone.now', return_value=timezone.now() + timedelta(days=91)):
+                response = self.client.get(f'/api/v1/sync/?since={token}')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Tombstone.objects.exists())
+
+
+class RecurringTests(UserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.account = Account.objects.create(owner=self.user, name='Checking', account_type='checking')
+
+    def test_materialize_is_idempotent(self):
+        from .services import recurring
+
+        template = Transaction.objects.create(
+            owner=self.user,
+            account=self.account,
+            amount=Decimal('-100.00'),
+            description='Rent',
+            date=date(2024, 1, 31),
+            is_recurring=True,
+            recurring_frequency='monthly',
+        )
+        self.assertEqual(template.next_run_date, date(2024, 2, 29))
+
+        stats = recurring.materialize_due(date(2024, 5, 15), batch_size=1)
+        self.assertEqual(stats['created'], 3)
+        self.assertEqual(recurring.materialize_due(date(2024, 5, 15))['created'], 0)
+
+        self.assertEqual(
+            list(template.occurrences.order_by('date').values_list('date', flat=True)),
+            [date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)],
+        )
+        template.refresh_from_db()
+        self.assertEqual(template.next_run_date, date(2024, 5, 31))
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('-400.00'))
+
+    def test_schedule_keeps_to_anchor(self):
+        from .services import recurring
+
+        day, dates = date(2024, 1, 31), []
+        for _ in range(4):
+            day = recurring.next_occurrence(day, 'monthly', date(2024, 1, 31))
+            dates.append(day)
+        self.assertEqual(dates, [date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30), date(2024, 5, 31)])
+
+        day, dates = date(2024, 2, 29), []
+        for _ in range(4):
+            day = recurring.next_occurrence(day, 'yearly', date(2024, 2, 29))
+            dates.append(day)
+        self.assertEqual(dates, [date(2025, 2, 28), date(2026, 2, 28), date(2027, 2, 28), date(2028, 2, 29)])
+
+    def test_occurrences_restamped_on_commit(self):
+        from .services import recurring
+
+        Transaction.objects.create(
+            owner=self.user, account=self.account, amount=Decimal('-5.00'), description='Coffee',
+            date=date(2024, 1, 1), is_recurring=True, recurring_frequency='daily',
+        )
+        with self.captureOnCommitCallbacks() as callbacks:
+            recurring.materialize_due(date(2024, 1, 3))
+        # As if the insert ran long before its transaction committed
+        stale = timezone.now() - timedelta(hours=1)
+        Transaction.objects.filter(recurring_parent__isnull=False).update(updated_at=stale)
+
+        for callback in callbacks:
+            callback()
+        occurrences = Transaction.objects.filter(recurring_parent__isnull=False)
+        self.assertEqual(occurrences.count(), 2)
+        self.assertFalse(occurrences.filter(updated_at__lte=stale).exists())
+
+
+class BudgetSpendingTests(UserTestCase):
+    def test_with_spending(self):
+        account = Account.objects.create(owner=self.user, name='Checking', account_type='checking')
+        living = Category.objects.create(owner=self.user, name='Living')
+        groceries = Category.objects.create(owner=self.user, name='Groceries', parent=living)
+        for category, day, amount in [
+            (groceries, date(2024, 4, 5), '-30.00'),
+            (groceries, date(2024, 4, 6), '20.00'),
+            (groceries, date(2024, 4, 20), '-80.00'),
+            (groceries, date(2024, 5, 1), '-50.00'),
+            (living, date(2024, 4, 10), '-15.00'),
+        ]:
+            Transaction.objects.create(
+                owner=self.user, account=account, category=category, amount=Decimal(amount),
+                description='Shop', date=day,
+            )
+
+        def add_budget(category, amount, start, end, **fields):
+            return Budget.objects.create(
+                owner=self.user, category=category, name=category.name, amount=Decimal(amount),
+                start_date=start, end_date=end, **fields
+            ).pk
+
+        april, april_end, may, may_end = date(2024, 4, 1), date(2024, 4, 30), date(2024, 5, 1), date(2024, 5, 31)
+        expected = {
+            add_budget(living, '100.00', april, april_end, include_subcategories=True):
+                (Decimal('125.00'), Decimal('0.00'), 100.0, True),
+            add_budget(groceries, '200.00', april, april_end): (Decimal('110.00'), Decimal('90.00'), 55.0, False),
+            add_budget(living, '80.00', may, may_end): (Decimal('0.00'), Decimal('80.00'), 0.0, False),
+        }
+
+        budgets = Budget.objects.with_spending()
+        self.assertEqual(
+            {
+                budget.pk: (
+                    budget.annotated_spent,
+                    budget.annotated_remaining,
+                    budget.annotated_percentage,
+                    budget.annotated_over_budget,
+                )
+                for budget in budgets
+            },
+            expected,
+        )
+
+
+class BudgetRolloverTests(UserTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(owner=self.user, name='Food')
+
+    def add_budget(self, start, end, period='monthly'):
+        return Budget.objects.create(
+            owner=self.user,
+            category=self.category,
+            name='Food',
+            amount=Decimal('100.00'),
+            period=period,
+            start_date=start,
+            end_date=end,
+        )
+
+    def test_rollover_skips_covered_periods(self):
+        from .services import budget_rollover
+
+        self.add_budget(date(2024, 1, 1), date(2024, 1, 31))
+        self.add_budget(date(2024, 2, 1), date(2024, 2, 29))
+
+        created = budget_rollover.rollover(today=date(2024, 4, 10))
+        self.assertEqual(
+            [(budget.start_date, budget.end_date) for budget in created],
+            [(date(2024, 3, 1), date(2024, 3, 31)), (date(2024, 4, 1), date(2024, 4, 30))],
+        )
+        self.assertEqual(budget_rollover.rollover(today=date(2024, 4, 10)), [])
+
+    def test_inactive_budget_in_successor_window(self):
+        from .services import budget_rollover
+
+        self.add_budget(date(2024, 1, 1), date(2024, 1, 31))
+        Budget.objects.create(
+            owner=self.user, category=self.category, name='Food', amount=Decimal('100.00'),
+            start_date=date(2024, 2, 1), end_date=date(2024, 2, 29), is_active=False,
+        )
+
+        created = budget_rollover.rollover(today=date(2024, 3, 1))
+        self.assertEqual(created, [])
+        self.assertEqual(Budget.objects.filter(is_active=True).count(), 1)
+
+    def test_rollover_action_is_idempotent(self):
+        end = date.today() - timedelta(days=1)
+        budget = self.add_budget(end - timedelta(days=29), end)
+        Budget.objects.filter(pk=budget.pk).update(include_subcategories=True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/v1/budgets/rollover/')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['start_date'], date.today().isoformat())
+
+        successor = Budget.objects.get(pk=response.data['results'][0]['id'])
+        self.assertEqual(
+            (successor.name, successor.amount, successor.period, successor.category_id, successor.include_subcategories),
+            ('Food', Decimal('100.00'), 'monthly', self.category.pk, True),
+        )
+        budget.refresh_from_db()
+        self.assertTrue(budget.rolled_over)
+
+        response = self.client.post('/api/v1/budgets/rollover/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 0)
+        self.assertEqual(Budget.objects.count(), 2)
+
+    def test_rollover_command(self):
+        self.add_budget(date(2024, 1, 1), date(2024, 3, 31), period='quarterly')
+        other = create_user('other@example.com')
+        Budget.objects.create(
+            owner=other, category=Category.objects.create(owner=other, name='Food'), name='Food',
+            amount=Decimal('50.00'), period='monthly', start_date=date(2024, 1, 1), end_date=date(2024, 1, 31),
+        )
+
+        out = StringIO()
+        call_command('rollover_budgets', user=self.user.email, date='2024-06-30', stdout=out)
+        self.assertIn('Created 1 budgets', out.getvalue())
+        successor = Budget.objects.get(owner=self.user, start_date=date(2024, 4, 1))
+        self.assertEqual((successor.end_date, successor.amount), (date(2024, 6, 30), Decimal('100.00')))
+        self.assertFalse(Budget.objects.filter(owner=other, start_date=date(2024, 2, 1)).exists())
+
+        out = StringIO()
+        call_command('rollover_budgets', user=self.user.email, date='2024-06-30', stdout=out)
+        self.assertIn('Created 0 budgets', out.getvalue())
+        self.assertEqual(Budget.objects.filter(owner=self.user).count(), 2)
+
+        with self.assertRaises(CommandError):
+            call_command('rollover_budgets', user='nobody@example.com')
+        with self.assertRaises(CommandError):
+            call_command('rollover_budgets', date='July')
+
+
+class BudgetForecastTests(UserTestCase):
+    def test_burn_rate_projection(self):
+        from .services import forecast
+
+        user = self.user
+        account = Account.objects.create(owner=user, name='Checking', account_type='checking')
+        parent = Category.objects.create(owner=user, name='Living')
+        child = Category.objects.create(owner=user, name='Groceries', parent=parent)
+        for day in range(1, 11):
+            Transaction.objects.create(
+                owner=user,
+                account=account,
+                category=child,
+                amount=Decimal('-10.00'),
+                description='Shop',
+                date=date(2024, 4, day),
+            )
+        budgets = [
+            Budget.objects.create(
+                owner=user, category=parent, name='Living', amount=Decimal('200.00'),
+                start_date=date(2024, 4, 1), end_date=date(2024, 4, 30), include_subcategories=True,
+            ),
+            Budget.objects.create(
+                owner=user, category=child, name='Groceries', amount=Decimal('50.00'),
+                start_date=date(2024, 4, 1), end_date=date(2024, 4, 30),
+            ),
+        ]
+
+        living, groceries = forecast.forecast(budgets, user, today=date(2024, 4, 10))
+        self.assertEqual(living['spent_to_date'], 100.0)
+        self.assertEqual(living['daily_burn_rate'], 10.0)
+        self.assertEqual(living['projected_spend'], 300.0)
+        self.assertEqual(living['exhaustion_date'], date(2024, 4, 20))
+        self.assertEqual(groceries['exhaustion_date'], date(2024, 4, 5))
+
+
+class GoalProgressTests(UserTestCase):
+    def test_linked_account_activity_moves_goal(self):
+        user = self.user
+        checking = Account.objects.create(owner=user, name='Checking', account_type='checking')
+        savings = Account.objects.create(owner=user, name='Savings', account_type='savings')
+        goal = Goal.objects.create(owner=user, name='Trip', target_amount=Decimal('100.00'), linked_account=savings)
+
+        Transaction.objects.create(
+            owner=user, account=checking, transfer_to=savings, amount=Decimal('-60.00'),
+            description='Transfer', date=date(2024, 1, 1),
+        )
+        interest = Transaction.objects.create(
+            owner=user, account=savings, amount=Decimal('40.00'), description='Interest', date=date(2024, 1, 2),
+        )
+        goal.refresh_from_db()
+        self.assertEqual(goal.current_amount, Decimal('100.00'))
+        self.assertTrue(goal.is_completed)
+        self.assertIsNotNone(goal.completed_at)
+
+        interest.delete()
+        goal.refresh_from_db()
+        self.assertEqual(goal.current_amount, Decimal('60.00'))
+        self.assertFalse(goal.is_completed)
+        self.assertIsNone(goal.completed_at)
+
+    def test_progress_never_goes_below_zero(self):
+        from .services import goal_progress
+
+        savings = Account.objects.create(owner=self.user, name='Savings', account_type='savings')
+        goal = Goal.objects.create(owner=self.user, name='Trip', target_amount=Decimal('100.00'), linked_account=savings)
+
+        Transaction.objects.create(
+            owner=self.user, account=savings, amount=Decimal('-30.00'), description='Withdrawal', date=date(2024, 1, 1),
+        )
+        goal.refresh_from_db()
+        self.assertEqual(goal.current_amount, Decimal('0.00'))
+
+        # A manual update validated against a stale amount
+        goal_progress.add_progress(goal, Decimal('-5.00'))
+        self.assertEqual(goal.current_amount, Decimal('0.00'))
@@ -1,6 +1,9 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AccountViewSet, CategoryViewSet, TransactionViewSet, BudgetViewSet, GoalViewSet
+from .views import (
+    AccountViewSet, CategoryViewSet, TransactionViewSet, BudgetViewSet, GoalViewSet, AnalyticsViewSet, SyncViewSet,
+    DashboardViewSet
+)
 
 app_name = 'finance'
 
@@ -11,6 +14,9 @@ router.register(r'categories', CategoryViewSet, basename='category')
 router.register(r'transactions', TransactionViewSet, basename='transaction')
 router.register(r'budgets', BudgetViewSet, basename='budget')
 router.register(r'goals', GoalViewSet, basename='goal')
+router.register(r'analytics', AnalyticsViewSet, basename='analytics')
+router.register(r'sync', SyncViewSet, basename='sync')
+router.register(r'dashboard', DashboardViewSet, basename='dashboard')
 
 urlpatterns = [
     path('', include(router.urls)),
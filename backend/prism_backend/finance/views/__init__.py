@@ -2,4 +2,7 @@ from .account import *
 from .category import *
 from .transaction import *
 from .budget import *
-from .goal import *
\ No newline at end of file
+from .goal import *
+from .analytics import *
+from .sync import *
+from .dashboard import *
\ No newline at end of file
@@ -4,12 +4,15 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter, SearchFilter
+from ..conditional import ConditionalGetMixin
 from ..models import Account
-from ..serializers import AccountSerializer, AccountSummarySerializer
+from ..services import response_cache
+from ..serializers import AccountSerializer, AccountBalanceAdjustmentSerializer, AccountSummarySerializer
+from django.db.models import Count, Q, Sum
 from decimal import Decimal
 
 
-class AccountViewSet(viewsets.ModelViewSet):
+class AccountViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing user accounts.
     All accounts are scoped to the authenticated user.
@@ -21,10 +24,12 @@ class AccountViewSet(viewsets.ModelViewSet):
     ordering_fields = ['name', 'balance', 'created_at']
     ordering = ['name']
     search_fields = ['name']
+    # Relations read by the serializers, joined up front to avoid N+1 queries
+    select_related_fields = ['owner']
 
     def get_queryset(self):
         """Return accounts for the authenticated user only"""
-        return Account.objects.filter(owner=self.request.user)
+        return Account.objects.filter(owner=self.request.user).select_related(*self.select_related_fields)
 
     def destroy(self, request, pk=None):
         """Delete an account with transaction check"""
@@ -47,28 +52,47 @@ class AccountViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=True, methods=['post'])
+    def adjust_balance(self, request, pk=None):
+        """Set the balance to a reconciled figure, e.g. from a bank statement"""
+        account = self.get_object()
+        serializer = AccountBalanceAdjustmentSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        account.adjust_balance(serializer.validated_data['balance'])
+        return Response(self.get_serializer(account).data)
+
     @action(detail=False, methods=['get'])
     def summary(self, request):
-        """Get account summary statistics"""
-        accounts = self.get_queryset()
+        """Get account summary statistics, cached per user until their data changes"""
+        data = response_cache.get_or_compute(request.user.pk, 'account_summary', self.build_summary)
+        return Response(data)
 
-        total_balance = sum(account.balance for account in accounts)
-        account_counts = {}
+    def build_summary(self):
+        """Compute the serialized account summary with one grouped query"""
+        rows = list(
+            self.get_queryset()
+            .order_by()
+            .values('account_type')
+            .annotate(
+                count=Count('id'),
+                balance_total=Sum('balance'),
+                active=Count('id', filter=Q(is_active=True)),
+            )
+        )
 
-        for account in accounts:
-            account_type = account.account_type
-            if account_type not in account_counts:
-                account_counts[account_type] = {'count': 0, 'balance': Decimal('0.00')}
-            account_counts[account_type]['count'] += 1
-            account_counts[account_type]['balance'] += account.balance
+        by_type = {row['account_type']: {
+            'count': row['count'],
+            # A number, as before; grouped sums lose their scale on SQLite
+            'balance': Decimal(row['balance_total']).quantize(Decimal('0.01'))
+        } for row in rows}
 
         summary_data = {
-            'total_accounts': accounts.count(),
-            'total_balance': total_balance,
-            'active_accounts': accounts.filter(is_active=True).count(),
-            'by_type': {k: {'count': v['count'], 'balance': v['balance']}
-                       for k, v in account_counts.items()}
+            'total_accounts': sum(row['count'] for row in rows),
+            'total_balance': sum((row['balance_total'] for row in rows), Decimal('0.00')),
+            'active_accounts': sum(row['active'] for row in rows),
+            'by_type': by_type,
         }
 
-        serializer = AccountSummarySerializer(summary_data)
-        return Response(serializer.data)
\ No newline at end of file
+        return AccountSummarySerializer(summary_data).data
\ No newline at end of file
@@ -0,0 +1,71 @@
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from ..filters import date_range
+from ..conditional import ConditionalGetMixin
+from ..models import Transaction
+from ..serializers import CashflowSerializer
+from ..services import analytics
+
+
+class AnalyticsViewSet(ConditionalGetMixin, viewsets.ViewSet):
+    """
+    ViewSet for aggregated reports computed in the database.
+    All reports are scoped to the authenticated user.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_transactions(self):
+        """Return transactions for the authenticated user, narrowed by account/category"""
+        queryset = Transaction.objects.filter(owner=self.request.user)
+
+        account = self.request.query_params.get('account')
+        if account:
+            queryset = queryset.filter(account_id=account)
+
+        category = self.request.query_params.get('category')
+        if category:
+            queryset = queryset.filter(category_id=category)
+
+        return queryset
+
+    @action(detail=False, methods=['get'])
+    def cashflow(self, request):
+        """
+        Get income, expenses and net per day, week or month.
+        Supports ?interval=, ?start_date=, ?end_date=, ?account=, ?category=
+        and ?breakdown=category|account. Empty buckets are included.
+        """
+        interval = request.query_params.get('interval', 'month')
+        if interval not in analytics.CASHFLOW_INTERVALS:
+            return Response(
+                {'error': f"interval must be one of: {', '.join(analytics.CASHFLOW_INTERVALS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        breakdown = request.query_params.get('breakdown') or None
+        if breakdown and breakdown not in analytics.CASHFLOW_BREAKDOWNS:
+            return Response(
+                {'error': f"breakdown must be one of: {', '.join(analytics.CASHFLOW_BREAKDOWNS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        for param in ('account', 'category'):
+            if not request.query_params.get(param, '0').isdigit():
+                return Response({'error': f'{param} must be an id'}, status=status.HTTP_400_BAD_REQUEST)
+
+        start_date, end_date = analytics.cashflow_window(interval, *date_range(request.query_params))
+        if start_date > end_date:
+            return Response(
+                {'error': 'start_date must be before end_date'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            data = analytics.cashflow(self.get_transactions(), interval, start_date, end_date, breakdown=breakdown)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = CashflowSerializer(data)
+        return Response(serializer.data)
@@ -4,13 +4,16 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter, SearchFilter
+from django.db.models import Count, Q, Sum
 from datetime import datetime
 from decimal import Decimal
+from ..conditional import ConditionalGetMixin
 from ..models import Budget
-from ..serializers import BudgetSerializer, BudgetCreateSerializer, BudgetSummarySerializer
+from ..services import budget_rollover, forecast, response_cache
+from ..serializers import BudgetSerializer, BudgetCreateSerializer, BudgetSummarySerializer, BudgetForecastSerializer
 
 
-class BudgetViewSet(viewsets.ModelViewSet):
+class BudgetViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing budgets.
     All budgets are scoped to the authenticated user.
@@ -21,10 +24,15 @@ class BudgetViewSet(viewsets.ModelViewSet):
     ordering_fields = ['name', 'amount', 'start_date', 'created_at']
     ordering = ['-start_date']
     search_fields = ['name']
+    select_related_fields = ['owner', 'category__parent']
 
     def get_queryset(self):
         """Return budgets for the authenticated user only"""
-        queryset = Budget.objects.filter(owner=self.request.user)
+        queryset = (
+            Budget.objects.filter(owner=self.request.user)
+            .select_related(*self.select_related_fields)
+            .with_spending()
+        )
 
         # Date range filtering
         start_date = self.request.query_params.get('start_date')
@@ -65,6 +73,10 @@ class BudgetViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def current(self, request):
         """Get current active budgets"""
+        return Response(self.build_current())
+
+    def build_current(self):
+        """Serialize the active budgets whose period includes today"""
         today = datetime.now().date()
         queryset = self.get_queryset().filter(
             is_active=True,
@@ -73,34 +85,78 @@ class BudgetViewSet(viewsets.ModelViewSet):
         )
 
         serializer = self.get_serializer(queryset, many=True)
-        return Response({
+        return {
             'count': len(serializer.data),
             'results': serializer.data
-        })
+        }
 
     @action(detail=False, methods=['get'])
     def over_budget(self, request):
-        """Get budgets that are over their limit"""
-        budgets = []
-        for budget in self.get_queryset().filter(is_active=True):
-            if budget.is_over_budget:
-                budgets.append(budget)
+        """Get budgets that are over their limit, paginated"""
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            is_active=True,
+            annotated_over_budget=True
+        )
 
-        serializer = self.get_serializer(budgets, many=True)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def forecast(self, request):
+        """Project end-of-period spend and exhaustion date for current budgets"""
+        today = datetime.now().date()
+        budgets = list(
+            Budget.objects.filter(
+                owner=request.user,
+                is_active=True,
+                start_date__lte=today,
+                end_date__gte=today
+            ).select_related('category').order_by('end_date', 'pk')
+        )
+
+        serializer = BudgetForecastSerializer(forecast.forecast(budgets, request.user, today), many=True)
         return Response({
             'count': len(serializer.data),
             'results': serializer.data
         })
 
+    @action(detail=False, methods=['post'])
+    def rollover(self, request):
+        """Create the next period for each of the user's budgets that has ended"""
+        created = budget_rollover.rollover(Budget.objects.filter(owner=request.user))
+
+        budgets = self.get_queryset().filter(pk__in=[budget.pk for budget in created])
+        serializer = self.get_serializer(budgets, many=True)
+        return Response({
+            'count': len(serializer.data),
+            'results': serializer.data
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
     @action(detail=False, methods=['get'])
     def summary(self, request):
-        """Get budget summary statistics"""
+        """Get budget summary statistics, cached per user until their data changes"""
+        # Keyed on the query string too, since the date filters narrow the budgets
+        data = response_cache.get_or_compute(
+            request.user.pk, 'budget_summary', self.build_summary, params=request.query_params
+        )
+        return Response(data)
+
+    def build_summary(self):
+        """Compute the serialized budget summary"""
         queryset = self.get_queryset().filter(is_active=True)
 
-        total_budgets = queryset.count()
-        total_budget_amount = sum(budget.amount for budget in queryset)
-        total_spent = sum(budget.spent_amount for budget in queryset)
-        over_budget_count = sum(1 for budget in queryset if budget.is_over_budget)
+        totals = queryset.aggregate(
+            total_budgets=Count('id'),
+            total_budget_amount=Sum('amount'),
+            total_spent=Sum('annotated_spent'),
+            over_budget_count=Count('id', filter=Q(annotated_over_budget=True)),
+        )
+
+        total_budgets = totals['total_budgets']
+        total_budget_amount = totals['total_budget_amount'] or Decimal('0.00')
+        total_spent = totals['total_spent'] or Decimal('0.00')
+        over_budget_count = totals['over_budget_count']
 
         summary_data = {
             'total_budgets': total_budgets,
@@ -111,5 +167,4 @@ class BudgetViewSet(viewsets.ModelViewSet):
             'on_track_count': total_budgets - over_budget_count,
         }
 
-        serializer = BudgetSummarySerializer(summary_data)
-        return Response(serializer.data)
\ No newline at end of file
+        return BudgetSummarySerializer(summary_data).data
\ No newline at end of file
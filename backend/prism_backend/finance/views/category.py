@@ -4,11 +4,16 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter, SearchFilter
-from ..models import Category
-from ..serializers import CategorySerializer, CategoryTreeSerializer
+from django.db.models import Sum
+from decimal import Decimal
+from ..conditional import ConditionalGetMixin
+from ..filters import date_range
+from ..models import Category, DailyRollup
+from ..serializers import CategorySerializer, CategorySpendingSerializer
+from ..services import category_tree
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing transaction categories.
     All categories are scoped to the authenticated user.
@@ -20,10 +25,18 @@ class CategoryViewSet(viewsets.ModelViewSet):
     ordering_fields = ['name', 'created_at']
     ordering = ['name']
     search_fields = ['name']
+    select_related_fields = ['owner', 'parent']
 
     def get_queryset(self):
         """Return categories for the authenticated user only"""
-        return Category.objects.filter(owner=self.request.user)
+        return Category.objects.filter(owner=self.request.user).select_related(*self.select_related_fields)
+
+    def get_serializer_context(self):
+        """Share one subcategory index across all nested serializers on reads"""
+        context = super().get_serializer_context()
+        if self.action in ('list', 'retrieve'):
+            context['subcategory_index'] = category_tree.subcategory_index(self.request.user)
+        return context
 
     def destroy(self, request, pk=None):
         """Delete a category with validation"""
@@ -56,15 +69,11 @@ class CategoryViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def tree(self, request):
         """Get categories organized as a tree structure"""
-        queryset = self.get_queryset().filter(is_active=True)
-
-        # Get parent categories
-        parent_categories = queryset.filter(parent__isnull=True)
-        serializer = CategoryTreeSerializer(parent_categories, many=True, context={'request': request})
+        data = category_tree.get_tree(request.user, self.get_serializer_context())
 
         return Response({
-            'count': len(serializer.data),
-            'results': serializer.data
+            'count': len(data),
+            'results': data
         })
 
     @action(detail=False, methods=['get'])
@@ -75,8 +84,10 @@ class CategoryViewSet(viewsets.ModelViewSet):
         income_categories = queryset.filter(category_type='income')
         expense_categories = queryset.filter(category_type='expense')
 
-        income_serializer = CategorySerializer(income_categories, many=True, context={'request': request})
-        expense_serializer = CategorySerializer(expense_categories, many=True, context={'request': request})
+        context = self.get_serializer_context()
+        context['subcategory_index'] = category_tree.subcategory_index(request.user)
+        income_serializer = CategorySerializer(income_categories, many=True, context=context)
+        expense_serializer = CategorySerializer(expense_categories, many=True, context=context)
 
         return Response({
             'income': {
@@ -87,4 +98,39 @@ class CategoryViewSet(viewsets.ModelViewSet):
                 'count': len(expense_serializer.data),
                 'categories': expense_serializer.data
             }
-        })
\ No newline at end of file
+        })
+
+    @action(detail=True, methods=['get'])
+    def spending(self, request, pk=None):
+        """Get income and expense totals for a category and all of its subcategories"""
+        category = self.get_object()
+        rollups = DailyRollup.objects.filter(
+            owner=request.user,
+            category__path__startswith=category.path
+        )
+
+        # Date range filtering
+        start_date, end_date = date_range(request.query_params)
+
+        if start_date:
+            rollups = rollups.filter(day__gte=start_date)
+
+        if end_date:
+            rollups = rollups.filter(day__lte=end_date)
+
+        totals = rollups.aggregate(
+            income=Sum('income_total'),
+            expenses=Sum('expense_total'),
+            transactions=Sum('transaction_count'),
+        )
+
+        spending_data = {
+            'category': category.id,
+            'category_full_name': category.full_name,
+            'total_income': totals['income'] or Decimal('0.00'),
+            'total_expenses': totals['expenses'] or Decimal('0.00'),
+            'total_transactions': totals['transactions'] or 0,
+        }
+
+        serializer = CategorySpendingSerializer(spending_data)
+        return Response(serializer.data)
\ No newline at end of file
@@ -0,0 +1,67 @@
+from rest_framework import status, viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from ..conditional import ConditionalGetMixin
+from ..services import response_cache
+from .account import AccountViewSet
+from .budget import BudgetViewSet
+from .goal import GoalViewSet
+from .transaction import TransactionViewSet
+
+# Section name -> (viewset, action, builder method) producing the same data
+# as the standalone endpoint of that action
+DASHBOARD_SECTIONS = {
+    'account_summary': (AccountViewSet, 'summary', 'build_summary'),
+    'transaction_summary': (TransactionViewSet, 'summary', 'build_summary'),
+    'recent_transactions': (TransactionViewSet, 'recent', 'build_recent'),
+    'current_budgets': (BudgetViewSet, 'current', 'build_current'),
+    'budget_summary': (BudgetViewSet, 'summary', 'build_summary'),
+    'goal_summary': (GoalViewSet, 'summary', 'build_summary'),
+}
+
+
+class DashboardViewSet(ConditionalGetMixin, viewsets.ViewSet):
+    """
+    All dashboard widgets in one request.
+    Each section is built by the viewset that serves it on its own, with one
+    query per section, and the assembled response is cached per user until
+    their data changes. Choose sections with ?include=name,name.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def parse_sections(self):
+        """Return the requested section names in a stable order"""
+        value = self.request.query_params.get('include')
+        if not value:
+            return list(DASHBOARD_SECTIONS)
+        names = {name.strip() for name in value.split(',') if name.strip()}
+        unknown = sorted(names - set(DASHBOARD_SECTIONS))
+        if unknown:
+            raise ValueError(f"Unknown dashboard section(s): {', '.join(unknown)}")
+        return [name for name in DASHBOARD_SECTIONS if name in names]
+
+    def section_view(self, viewset_class, action):
+        """Instantiate a viewset bound to this request, as its own dispatch would"""
+        view = viewset_class(request=self.request, format_kwarg=None, action=action, args=(), kwargs={})
+        view.headers = {}
+        return view
+
+    def list(self, request):
+        """Get the requested dashboard sections, cached per user until their data changes"""
+        try:
+            sections = self.parse_sections()
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        def build_dashboard():
+            data = {}
+            for name in sections:
+                viewset_class, action, builder = DASHBOARD_SECTIONS[name]
+                data[name] = getattr(self.section_view(viewset_class, action), builder)()
+            return data
+
+        # Sections read ?start_date=/?end_date= like their own endpoints, so vary on the query string
+        data = response_cache.get_or_compute(
+            request.user.pk, 'dashboard', build_dashboard, params=request.query_params
+        )
+        return Response(data)
@@ -6,11 +6,14 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter, SearchFilter
 from datetime import datetime
 from decimal import Decimal
+from django.db.models import Count, Q, Sum
+from ..conditional import ConditionalGetMixin
 from ..models import Goal
+from ..services import response_cache
 from ..serializers import GoalSerializer, GoalCreateSerializer, GoalProgressUpdateSerializer, GoalSummarySerializer
 
 
-class GoalViewSet(viewsets.ModelViewSet):
+class GoalViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing financial goals.
     All goals are scoped to the authenticated user.
@@ -21,10 +24,15 @@ class GoalViewSet(viewsets.ModelViewSet):
     ordering_fields = ['name', 'target_amount', 'target_date', 'created_at']
     ordering = ['-created_at']
     search_fields = ['name', 'description']
+    select_related_fields = ['owner', 'linked_account']
 
     def get_queryset(self):
         """Return goals for the authenticated user only"""
-        return Goal.objects.filter(owner=self.request.user)
+        return (
+            Goal.objects.filter(owner=self.request.user)
+            .select_related(*self.select_related_fields)
+            .with_progress()
+        )
 
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -87,44 +95,48 @@ class GoalViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def near_target(self, request):
-        """Get goals that are close to their target (>80% progress)"""
-        goals = []
-        for goal in self.get_queryset().filter(is_active=True, is_completed=False):
-            if goal.progress_percentage >= 80:
-                goals.append(goal)
+        """Get goals that are close to their target (>80% progress), paginated"""
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            is_active=True,
+            is_completed=False,
+            annotated_progress__gte=80
+        )
 
-        serializer = self.get_serializer(goals, many=True)
-        return Response({
-            'count': len(serializer.data),
-            'results': serializer.data
-        })
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def summary(self, request):
-        """Get goal summary statistics"""
-        queryset = self.get_queryset()
-
-        total_goals = queryset.count()
-        active_goals = queryset.filter(is_active=True, is_completed=False).count()
-        completed_goals = queryset.filter(is_completed=True).count()
-
-        total_target_amount = sum(goal.target_amount for goal in queryset.filter(is_active=True))
-        total_saved_amount = sum(goal.current_amount for goal in queryset.filter(is_active=True))
-
-        # Goals by type
-        goal_types = {}
-        for goal in queryset:
-            goal_type = goal.goal_type
-            if goal_type not in goal_types:
-                goal_types[goal_type] = {'count': 0, 'target_amount': Decimal('0.00'), 'saved_amount': Decimal('0.00')}
-            goal_types[goal_type]['count'] += 1
-            goal_types[goal_type]['target_amount'] += goal.target_amount
-            goal_types[goal_type]['saved_amount'] += goal.current_amount
+        """Get goal summary statistics, cached per user until their data changes"""
+        data = response_cache.get_or_compute(request.user.pk, 'goal_summary', self.build_summary)
+        return Response(data)
+
+    def build_summary(self):
+        """Compute the serialized goal summary with one grouped query"""
+        active = Q(is_active=True)
+        rows = list(
+            self.get_queryset()
+            .order_by()
+            .values('goal_type')
+            .annotate(
+                count=Count('id'),
+                active_count=Count('id', filter=active & Q(is_completed=False)),
+                completed_count=Count('id', filter=Q(is_completed=True)),
+                target_total=Sum('target_amount'),
+                saved_total=Sum('current_amount'),
+                active_target_total=Sum('target_amount', filter=active),
+                active_saved_total=Sum('current_amount', filter=active),
+            )
+        )
+
+        total_target_amount = sum((row['active_target_total'] or 0 for row in rows), Decimal('0.00'))
+        total_saved_amount = sum((row['active_saved_total'] or 0 for row in rows), Decimal('0.00'))
 
         summary_data = {
-            'total_goals': total_goals,
-            'active_goals': active_goals,
-            'completed_goals': completed_goals,
+            'total_goals': sum(row['count'] for row in rows),
+            'active_goals': sum(row['active_count'] for row in rows),
+            'completed_goals': sum(row['completed_count'] for row in rows),
             'total_target_amount': total_target_amount,
             'total_saved_amount': total_saved_amount,
             'total_remaining_amount': total_target_amount - total_saved_amount,
@@ -132,12 +144,11 @@ class GoalViewSet(viewsets.ModelViewSet):
                 (total_saved_amount / total_target_amount * 100) if total_target_amount > 0 else 0,
                 2
             ),
-            'by_type': {k: {
-                'count': v['count'],
-                'target_amount': str(v['target_amount']),
-                'saved_amount': str(v['saved_amount'])
-            } for k, v in goal_types.items()}
+            'by_type': {row['goal_type']: {
+                'count': row['count'],
+                'target_amount': f"{row['target_total']:.2f}",
+                'saved_amount': f"{row['saved_total']:.2f}"
+            } for row in rows}
         }
 
-        serializer = GoalSummarySerializer(summary_data)
-        return Response(serializer.data)
\ No newline at end of file
+        return GoalSummarySerializer(summary_data).data
\ No newline at end of file
@@ -0,0 +1,48 @@
+from rest_framework import status, viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from ..conditional import ConditionalGetMixin
+from ..serializers import (
+    AccountSerializer, CategorySerializer, TransactionSerializer, BudgetSerializer, GoalSerializer
+)
+from ..services import category_tree, sync
+
+
+class SyncViewSet(ConditionalGetMixin, viewsets.ViewSet):
+    """
+    Delta feed of the authenticated user's finance records for offline clients.
+    """
+    permission_classes = [IsAuthenticated]
+    page_size = 500
+    serializer_classes = {
+        'accounts': AccountSerializer,
+        'categories': CategorySerializer,
+        'transactions': TransactionSerializer,
+        'budgets': BudgetSerializer,
+        'goals': GoalSerializer,
+    }
+
+    def list(self, request):
+        """
+        Get records created or updated, and ids deleted, since ?since=<token>.
+        Omit the token for a full sync. Keep requesting with the returned
+        'next' token while 'has_more' is true, then store it for the next sync.
+        """
+        try:
+            result = sync.changes(request.user, request.query_params.get('since'), limit=self.page_size)
+        except sync.InvalidToken as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        context = {'request': request}
+        if result['changes']['categories']:
+            context['subcategory_index'] = category_tree.subcategory_index(request.user)
+
+        return Response({
+            'changes': {
+                name: self.serializer_classes[name](rows, many=True, context=context).data
+                for name, rows in result['changes'].items()
+            },
+            'deleted': result['deleted'],
+            'has_more': result['has_more'],
+            'next': result['next'],
+        })
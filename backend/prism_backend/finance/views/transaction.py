@@ -4,46 +4,51 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter, SearchFilter
-from django.db.models import Sum
+from rest_framework.parsers import MultiPartParser
+from django.http import StreamingHttpResponse
 from datetime import datetime, timedelta
-from decimal import Decimal
-from ..models import Transaction
-from ..serializers import TransactionSerializer, TransactionCreateSerializer, TransactionSummarySerializer
-
-
-class TransactionViewSet(viewsets.ModelViewSet):
+import io
+from django.conf import settings
+from ..filters import date_range
+from ..conditional import ConditionalGetMixin
+from ..models import Account, Category, Transaction
+from ..pagination import TransactionPagination
+from ..services import analytics, export, response_cache, statements
+from ..serializers import (
+    TransactionSerializer, TransactionCreateSerializer, TransactionBulkCreateSerializer, TransactionSummarySerializer
+)
+
+
+class TransactionViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing financial transactions.
     All transactions are scoped to the authenticated user.
+    List supports keyset pagination with ?cursor= (see TransactionPagination).
     """
     permission_classes = [IsAuthenticated]
+    pagination_class = TransactionPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
     filterset_fields = ['account', 'category', 'is_recurring']
     ordering_fields = ['date', 'amount', 'created_at']
     ordering = ['-date', '-created_at']
     search_fields = ['description', 'notes']
+    select_related_fields = ['owner', 'account', 'category__parent', 'transfer_to']
+    export_chunk_size = 2000
 
     def get_queryset(self):
         """Return transactions for the authenticated user only"""
-        queryset = Transaction.objects.filter(owner=self.request.user)
+        queryset = Transaction.objects.filter(owner=self.request.user).select_related(
+            *self.select_related_fields
+        )
 
         # Date range filtering
-        start_date = self.request.query_params.get('start_date')
-        end_date = self.request.query_params.get('end_date')
+        start_date, end_date = date_range(self.request.query_params)
 
         if start_date:
-            try:
-                start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-                queryset = queryset.filter(date__gte=start_date)
-            except ValueError:
-                pass
+            queryset = queryset.filter(date__gte=start_date)
 
         if end_date:
-            try:
-                end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
-                queryset = queryset.filter(date__lte=end_date)
-            except ValueError:
-                pass
+            queryset = queryset.filter(date__lte=end_date)
 
         return queryset
 
@@ -63,40 +68,166 @@ class TransactionViewSet(viewsets.ModelViewSet):
             return Response(response_serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Create many transactions in one request with batched validation"""
+        # The JSON parser reads the body as a stream, which Django does not size-check
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+        if length > settings.DATA_UPLOAD_MAX_MEMORY_SIZE:
+            return Response(
+                {'error': f'Request body cannot be larger than {settings.DATA_UPLOAD_MAX_MEMORY_SIZE} bytes'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+
+        rows = request.data
+        if not isinstance(rows, list):
+            return Response(
+                {'error': 'Expected a list of transactions'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(rows) > settings.TRANSACTION_BULK_MAX_ROWS:
+            return Response(
+                {'error': f'Cannot create more than {settings.TRANSACTION_BULK_MAX_ROWS} transactions per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Prefetch every referenced account and category in one query each
+        account_ids, category_ids = set(), set()
+        for row in rows:
+            if isinstance(row, dict):
+                account_ids.update(_ids(row.get('account_id'), row.get('transfer_to_id')))
+                category_ids.update(_ids(row.get('category_id')))
+
+        serializer = TransactionBulkCreateSerializer(
+            data=rows,
+            context={
+                'request': request,
+                'accounts': Account.objects.filter(owner=request.user).in_bulk(account_ids),
+                'categories': Category.objects.filter(owner=request.user).in_bulk(category_ids),
+            }
+        )
+
+        if not serializer.is_valid():
+            return Response({
+                'errors': [
+                    {'index': index, 'errors': errors}
+                    for index, errors in enumerate(serializer.errors) if errors
+                ]
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        transactions = serializer.save()
+        return Response({
+            'count': len(transactions),
+            'ids': [transaction.pk for transaction in transactions],
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_statement(self, request):
+        """Import a CSV or OFX statement file into one of the user's accounts"""
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response(
+                {'error': 'A statement file is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            account = Account.objects.get(id=request.data.get('account_id'), owner=request.user)
+        except (Account.DoesNotExist, ValueError, TypeError):
+            return Response(
+                {'error': 'Account not found or does not belong to you'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        file_format = request.data.get('format') or statements.detect_format(upload.name)
+        if file_format not in ('csv', 'ofx'):
+            return Response(
+                {'error': 'Format must be csv or ofx'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            report = statements.import_statement(
+                io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline=''),
+                request.user,
+                account,
+                file_format=file_format,
+                batch_size=settings.TRANSACTION_BULK_BATCH_SIZE,
+                date_format=request.data.get('date_format') or None,
+            )
+        except (statements.StatementError, UnicodeDecodeError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(report, status=status.HTTP_201_CREATED)
+
     @action(detail=False, methods=['get'])
-    def summary(self, request):
-        """Get transaction summary statistics"""
-        queryset = self.get_queryset()
-
-        # Calculate totals
-        income_total = queryset.filter(amount__gt=0).aggregate(Sum('amount'))['amount__sum'] or Decimal('0.00')
-        expense_total = abs(queryset.filter(amount__lt=0).aggregate(Sum('amount'))['amount__sum'] or Decimal('0.00'))
-        net_income = income_total - expense_total
-
-        summary_data = {
-            'total_transactions': queryset.count(),
-            'total_income': income_total,
-            'total_expenses': expense_total,
-            'net_income': net_income,
-            'income_transactions': queryset.filter(amount__gt=0).count(),
-            'expense_transactions': queryset.filter(amount__lt=0).count(),
-            'transfer_transactions': queryset.filter(transfer_to__isnull=False).count(),
-        }
+    def export(self, request):
+        """Stream the filtered transaction history as CSV or NDJSON"""
+        # 'format' is reserved by DRF for renderer selection
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in export.CONTENT_TYPES:
+            return Response(
+                {'error': 'export_format must be csv or ndjson'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            export.stream(queryset, export_format, chunk_size=self.export_chunk_size),
+            content_type=export.CONTENT_TYPES[export_format]
+        )
+        response['Content-Disposition'] = f'attachment; filename="transactions.{export_format}"'
+        return response
 
-        serializer = TransactionSummarySerializer(summary_data)
-        return Response(serializer.data)
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """
+        Get transaction summary statistics in a single query.
+        Optional ?group_by=category,account,month adds per-group breakdowns.
+        """
+        try:
+            group_by = analytics.parse_dimensions(request.query_params.get('group_by'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Cached per user and query string until the user's data changes
+        data = response_cache.get_or_compute(
+            request.user.pk, 'transaction_summary', lambda: self.build_summary(group_by), params=request.query_params
+        )
+        return Response(data)
+
+    def build_summary(self, group_by=()):
+        """Compute the serialized transaction summary"""
+        summary_data = analytics.transaction_summary(self.get_queryset(), group_by=group_by)
+        return TransactionSummarySerializer(summary_data).data
 
     @action(detail=False, methods=['get'])
     def recent(self, request):
         """Get recent transactions (last 30 days)"""
-        thirty_days_ago = datetime.now().date() - timedelta(days=30)
-        queryset = self.get_queryset().filter(date__gte=thirty_days_ago)
-
         limit = int(request.query_params.get('limit', 10))
-        transactions = queryset[:limit]
+        return Response(self.build_recent(limit))
+
+    def build_recent(self, limit=10):
+        """Serialize up to limit transactions from the last 30 days"""
+        thirty_days_ago = datetime.now().date() - timedelta(days=30)
+        transactions = self.get_queryset().filter(date__gte=thirty_days_ago)[:limit]
 
         serializer = self.get_serializer(transactions, many=True)
-        return Response({
+        return {
             'count': len(serializer.data),
             'results': serializer.data
-        })
\ No newline at end of file
+        }
+
+
+def _ids(*values):
+    """Return the values that look like integer ids."""
+    ids = []
+    for value in values:
+        try:
+            ids.append(int(value))
+        except (TypeError, ValueError):
+            pass
+    return ids
\ No newline at end of file
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 from pathlib import Path
 import os
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 import dj_database_url
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -95,6 +96,50 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+# Redis when REDIS_URL is set, a shared directory when CACHE_DIR is set,
+# otherwise process-local memory (development and tests). Cache
+# invalidation, ETags and login throttling only work across processes on a
+# shared backend, so more than one gunicorn worker (WEB_CONCURRENCY, which
+# gunicorn reads as its worker count) requires one.
+REDIS_URL = config('REDIS_URL', default='')
+CACHE_DIR = config('CACHE_DIR', default='')
+WEB_CONCURRENCY = config('WEB_CONCURRENCY', default=1, cast=int)
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+elif CACHE_DIR:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': CACHE_DIR,
+        }
+    }
+elif WEB_CONCURRENCY > 1:
+    raise ImproperlyConfigured(
+        'WEB_CONCURRENCY > 1 needs a cache shared by all workers; set REDIS_URL or CACHE_DIR'
+    )
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'prism',
+        }
+    }
+
+# Seconds a cached summary response may live before it is recomputed
+SUMMARY_CACHE_TIMEOUT = config('SUMMARY_CACHE_TIMEOUT', default=300, cast=int)
+
+# Days deletions are kept for sync clients; older sync tokens are refused
+SYNC_TOMBSTONE_RETENTION_DAYS = config('SYNC_TOMBSTONE_RETENTION_DAYS', default=90, cast=int)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -113,6 +158,37 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing. PASSWORD_HASHER_PROFILE picks the hasher for new
+# hashes; the others stay listed so existing hashes still verify, and are
+# upgraded to the preferred hasher and costs on the user's next login.
+# The argon2 profile needs argon2-cffi.
+PASSWORD_HASHER_PROFILE = config('PASSWORD_HASHER_PROFILE', default='pbkdf2')
+PASSWORD_HASHER_PROFILES = {
+    'pbkdf2': 'prism_backend.core.hashers.PBKDF2PasswordHasher',
+    'argon2': 'prism_backend.core.hashers.Argon2PasswordHasher',
+    'scrypt': 'prism_backend.core.hashers.ScryptPasswordHasher',
+}
+PASSWORD_HASHERS = [PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]] + [
+    hasher for profile, hasher in PASSWORD_HASHER_PROFILES.items() if profile != PASSWORD_HASHER_PROFILE
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
+# Cost parameters per algorithm, bounding the CPU spent on each login
+PASSWORD_HASHER_COSTS = {
+    'pbkdf2_sha256': {
+        'iterations': config('PASSWORD_PBKDF2_ITERATIONS', default=870000, cast=int),
+    },
+    'argon2': {
+        'time_cost': config('PASSWORD_ARGON2_TIME_COST', default=2, cast=int),
+        'memory_cost': config('PASSWORD_ARGON2_MEMORY_COST', default=19456, cast=int),
+        'parallelism': config('PASSWORD_ARGON2_PARALLELISM', default=1, cast=int),
+    },
+    'scrypt': {
+        'work_factor': config('PASSWORD_SCRYPT_WORK_FACTOR', default=2 ** 14, cast=int),
+        'block_size': config('PASSWORD_SCRYPT_BLOCK_SIZE', default=8, cast=int),
+        'parallelism': config('PASSWORD_SCRYPT_PARALLELISM', default=1, cast=int),
+    },
+}
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
@@ -141,8 +217,16 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework Configuration
+# Authenticate read-only requests from a per-process cache of user rows
+# instead of loading the user on every request. Deactivated or deleted
+# users are rejected at most JWT_USER_CACHE_TTL seconds after the change.
+JWT_CACHED_USER_AUTH = config('JWT_CACHED_USER_AUTH', default=False, cast=bool)
+JWT_USER_CACHE_TTL = config('JWT_USER_CACHE_TTL', default=30, cast=int)
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'prism_backend.core.authentication.CachedJWTAuthentication'
+        if JWT_CACHED_USER_AUTH else
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -153,11 +237,29 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
         'rest_framework.filters.SearchFilter',
     ],
+    # Reverse proxies in front of the app (1 behind the compose nginx). Throttles
+    # take the client address from that many hops back in X-Forwarded-For, so
+    # clients cannot pick their own identity; with 0 they use REMOTE_ADDR.
+    'NUM_PROXIES': config('NUM_PROXIES', default=0, cast=int),
+    # Token buckets for the login endpoint (see core.throttling)
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': config('LOGIN_RATE_IP', default='30/min'),
+        'login_account': config('LOGIN_RATE_ACCOUNT', default='10/min'),
+    },
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# Bulk transaction ingestion
+TRANSACTION_BULK_BATCH_SIZE = config('TRANSACTION_BULK_BATCH_SIZE', default=500, cast=int)
+TRANSACTION_BULK_MAX_ROWS = config('TRANSACTION_BULK_MAX_ROWS', default=50000, cast=int)
+# Room for TRANSACTION_BULK_MAX_ROWS rows of up to 500 bytes of JSON each.
+# nginx.conf's client_max_body_size must be at least this.
+DATA_UPLOAD_MAX_MEMORY_SIZE = config(
+    'DATA_UPLOAD_MAX_MEMORY_SIZE', default=TRANSACTION_BULK_MAX_ROWS * 500, cast=int
+)
+
 # Spectacular settings for OpenAPI schema
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Prism Financial API',
@@ -23,6 +23,11 @@ export const accountService = {
     return apiService.put<Account>(`/api/v1/accounts/${id}/`, data)
   },
 
+  // Balances follow transactions; set a reconciled figure explicitly
+  async adjustBalance(id: number, balance: string): Promise<Account> {
+    return apiService.post<Account>(`/api/v1/accounts/${id}/adjust_balance/`, { balance })
+  },
+
   async deleteAccount(id: number): Promise<void> {
     return apiService.delete<void>(`/api/v1/accounts/${id}/`)
   },
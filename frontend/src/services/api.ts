@@ -4,6 +4,7 @@ const BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
 
 class ApiService {
   private api: AxiosInstance
+  private refreshing: Promise<string | null> | null = null
 
   constructor() {
     this.api = axios.create({
@@ -35,16 +36,9 @@ class ApiService {
           originalRequest._retry = true
 
           try {
-            const refreshToken = localStorage.getItem('refreshToken')
-            if (refreshToken) {
-              const response = await axios.post(`${BASE_URL}/api/auth/token/refresh/`, {
-                refresh: refreshToken,
-              })
-
-              const newToken = response.data.access
-              localStorage.setItem('accessToken', newToken)
+            const newToken = await this.refreshAccessToken()
+            if (newToken) {
               originalRequest.headers.Authorization = `Bearer ${newToken}`
-
               return this.api(originalRequest)
             }
           } catch (refreshError) {
@@ -60,6 +54,32 @@ class ApiService {
     )
   }
 
+  // Refresh tokens are single use, so requests that fail with 401 together
+  // share one refresh instead of each presenting the same token
+  private refreshAccessToken(): Promise<string | null> {
+    if (!this.refreshing) {
+      this.refreshing = this.requestNewTokens().finally(() => {
+        this.refreshing = null
+      })
+    }
+    return this.refreshing
+  }
+
+  private async requestNewTokens(): Promise<string | null> {
+    const refreshToken = localStorage.getItem('refreshToken')
+    if (!refreshToken) {
+      return null
+    }
+
+    const response = await axios.post(`${BASE_URL}/api/v1/auth/refresh/`, {
+      refresh: refreshToken,
+    })
+    localStorage.setItem('accessToken', response.data.access)
+    // Keep the rotated refresh token; the old one is now revoked
+    localStorage.setItem('refreshToken', response.data.refresh)
+    return response.data.access
+  }
+
   async get<T>(url: string): Promise<T> {
     const response: AxiosResponse<T> = await this.api.get(url)
     return response.data
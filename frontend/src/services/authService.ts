@@ -17,31 +17,31 @@ interface RegisterData extends RegisterRequest {}
 
 export const authService = {
   async login(email: string, password: string): Promise<LoginResponse> {
-    return apiService.post<LoginResponse>('/api/auth/login/', {
+    return apiService.post<LoginResponse>('/api/v1/auth/login/', {
       email,
       password,
     })
   },
 
   async register(userData: RegisterData): Promise<LoginResponse> {
-    return apiService.post<LoginResponse>('/api/auth/register/', userData)
+    return apiService.post<LoginResponse>('/api/v1/auth/register/', userData)
   },
 
   async logout(): Promise<void> {
     const refreshToken = localStorage.getItem('refreshToken')
     if (refreshToken) {
-      await apiService.post('/api/auth/logout/', {
+      await apiService.post('/api/v1/auth/logout/', {
         refresh: refreshToken,
       })
     }
   },
 
   async getCurrentUser() {
-    return apiService.get('/api/users/profile/')
+    return apiService.get('/api/v1/user/profile/')
   },
 
-  async refreshToken(refreshToken: string): Promise<{ access: string }> {
-    return apiService.post<{ access: string }>('/api/auth/token/refresh/', {
+  async refreshToken(refreshToken: string): Promise<{ access: string; refresh: string }> {
+    return apiService.post<{ access: string; refresh: string }>('/api/v1/auth/refresh/', {
       refresh: refreshToken,
     })
   },